@@ -0,0 +1,70 @@
+import json
+import os
+
+
+def details(methods: int) -> tuple:
+    definitions = {}
+    declarations = {}
+    decorations = {'methods': {}, 'groups': {'see': []}, '*': {'see': [], 'link': [], 'throws': ['Exception']}}
+    for index in range(methods):
+        name = f"method{index}"
+        definitions[name] = {
+            'definition': f"Performs operation number {index} on `subject`",
+            'return': {'int': {'when': 'on success', 'return': ':count'}, 'null': {'when': 'on failure', 'return': '`null`'}},
+            'const': {'count': 'the number of operations'},
+        }
+        declarations[name] = {
+            'param': {
+                'subject': 'string',
+                'flags': {'bit-sum': ['FIRST_FLAG', 'SECOND_FLAG']},
+                'matches': ['string[]', 'optional', '&ref'],
+                'map': {'type': {'type': 'array', 'keys': 'int', 'values': 'string'}, 'optional': True},
+            },
+            'template': {'T': ['int', 'string']},
+            'return-type': ['int', 'null'],
+        }
+        decorations['methods'][name] = {'see': [f"method{(index + 1) % methods}"], 'link': [], 'manual': {'php': None}, 'throws': []}
+    return definitions, declarations, decorations
+
+
+def template(class_name: str, methods: int) -> str:
+    lines = ['<?php', 'namespace Benchmark;', '', '/**', ' * {@documentary::class}', ' */', f'class {class_name}', '{']
+    for index in range(methods):
+        lines.extend([
+            '    /**',
+            f'     * @documentary method{index}',
+            '     */',
+            f'    public function method{index}(string $subject, int $flags, array &$matches = null, array $map = []): ?int',
+            '    {',
+            '        return null;',
+            '    }',
+            '',
+        ])
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+def generate(root: str, classes: int, methods: int) -> None:
+    # A project of `classes` templates with `methods` placeholders each, their details, fragments of methods
+    # and classes, and fragments and snippets shared by the whole project.
+    definitions, declarations, decorations = details(methods)
+    decorations['class'] = {'snippets': ['shared']}
+    _store(root, 'documentary/project/fragment/param.subject.html', 'Subject, which is matched against the `pattern`.')
+    _store(root, 'documentary/project/fragment/param.flags.html', 'A `bit-sum` of flags, modifying the behaviour.')
+    _store(root, 'documentary/project/snippet/shared.html', 'Methods of this class are documented\nwith `documentary`.')
+    for index in range(classes):
+        class_name = f"Class{index}"
+        _store(root, f'src/{class_name}.php', template(class_name, methods))
+        documentation = f'documentary/src/{class_name}.php'
+        _store(root, f'{documentation}/definition.json', json.dumps(definitions, indent=4))
+        _store(root, f'{documentation}/declaration.json', json.dumps(declarations, indent=4))
+        _store(root, f'{documentation}/decoration.json', json.dumps(decorations, indent=4))
+        _store(root, f'{documentation}/fragments/param.matches.html', 'Array, populated with the `matches` of the `subject`.')
+        _store(root, f'{documentation}/fragments/method0.param.map.html', 'Map of <b>groups</b> to their `names`.')
+
+
+def _store(root: str, filename: str, content: str) -> None:
+    filename = os.path.join(root, filename)
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    with open(filename, 'w') as file:
+        file.write(content)
@@ -0,0 +1,106 @@
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import tempfile
+import timeit
+from contextlib import redirect_stdout
+
+from benchmarks.corpus import generate
+from documentary.details.preprocess_details import load_details
+from documentary.document import document_many
+from documentary.folder import discover_templates
+from documentary.format_comment import format_comment
+from documentary.template import bootstrap
+
+
+def scenarios(root: str, jobs: int) -> dict:
+    documentary = os.path.join(root, 'documentary')
+    documentation = os.path.join(documentary, 'src', 'Class0.php')
+    details_files = [os.path.join(documentation, name) for name in ['definition.json', 'declaration.json', 'decoration.json']]
+    details, class_details = load_details(*details_files)
+    with open(os.path.join(root, 'src', 'Class0.php')) as file:
+        template = file.read()
+    populate = bootstrap(details, class_details, documentary, os.path.join(documentation, 'fragments'), True)
+    method = next(iter(details.values()))
+
+    def document():
+        with redirect_stdout(io.StringIO()):
+            document_many(documentary, root, 'src', os.path.join(root, 'output'), jobs=jobs)
+
+    return {
+        'discover_templates': lambda: discover_templates('src', root, documentary),
+        'load_details': lambda: load_details(*details_files),
+        'populate': lambda: populate(template),
+        'format_comment': lambda: format_comment(method, lambda name: name, lambda param: 'Summary of `param`.', lambda: '', None, 4),
+        'document_many': document,
+    }
+
+
+def measure(function: callable, repeat: int) -> dict:
+    # Fast scenarios are called many times per repetition, so times are per call.
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    times = [elapsed / number for elapsed in timer.repeat(repeat, number)]
+    return {'best': min(times), 'mean': statistics.mean(times), 'repeat': repeat, 'number': number}
+
+
+def compare(results: dict, baseline: dict) -> list:
+    lines = []
+    for name, result in results['results'].items():
+        if name in baseline['results']:
+            ratio = result['best'] / baseline['results'][name]['best']
+            lines.append(f"{name:>20}: {ratio:6.2f}x of {baseline.get('commit') or 'baseline'}")
+    return lines
+
+
+def _commit() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures throughput of documenting a generated project")
+    parser.add_argument("--classes", type=int, default=200)
+    parser.add_argument("--methods", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--scenario", action='append', help="run only the given scenarios")
+    parser.add_argument("--output", help="save results to a JSON file", metavar="FILE")
+    parser.add_argument("--compare", help="compare results with results saved before", metavar="FILE")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp()
+    try:
+        generate(root, args.classes, args.methods)
+        results = {}
+        for name, function in scenarios(root, args.jobs).items():
+            if args.scenario is None or name in args.scenario:
+                results[name] = measure(function, args.repeat)
+                print(f"{name:>20}: {results[name]['best'] * 1000:10.3f}ms best, {results[name]['mean'] * 1000:10.3f}ms mean")
+    finally:
+        shutil.rmtree(root)
+
+    report = {
+        'commit': _commit(),
+        'python': platform.python_version(),
+        'parameters': {'classes': args.classes, 'methods': args.methods, 'repeat': args.repeat, 'jobs': args.jobs},
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            for line in compare(report, json.load(file)):
+                print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+import argparse
+import time
+
+from benchmarks.corpus import details
+from documentary import validate
+
+
+def measure(validate_all: callable, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        validate_all()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures validation throughput of details")
+    parser.add_argument("--methods", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    definitions, declarations, decorations = details(args.methods)
+
+    def with_checks():
+        validate.definitions(definitions)
+        validate.declarations(declarations)
+        validate.decorations(decorations)
+
+    def with_schema():
+        validate.definitions_schema().validate(definitions)
+        validate.declarations_schema().validate(declarations)
+        validate.decorations_schema().validate(decorations)
+
+    for name, validate_all in [('checks', with_checks), ('schema', with_schema)]:
+        elapsed = measure(validate_all, args.repeat)
+        print(f"{name:>8}: {elapsed:8.3f}s, {args.methods / elapsed:12.0f} methods/s")
+
+
+if __name__ == '__main__':
+    main()
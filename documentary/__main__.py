@@ -1,11 +1,76 @@
-from documentary.args import parse_args
-from documentary.document import document_many
+import os
+import sys
+from os import path
+
+from documentary.args import parse_args, parse_serve_args, unsupported_options
 from documentary.paths import resolve_paths
 
 
+# Modules which document templates are imported only once arguments and paths are known to be valid,
+# so runs which end early (e.g. --help, or a missing documentary folder) start quickly.
+
 def main():
-    documentary_path, root_path, template, output_path = resolve_paths(parse_args())
-    document_many(documentary_path, root_path, template, output_path)
+    if sys.argv[1:2] == ['serve']:
+        from documentary.server import serve
+        serve(parse_serve_args(sys.argv[2:]).socket)
+        return
+    args = parse_args()
+    if args.server:
+        from documentary.server import request
+        status, output = request(args.server, _without_server(sys.argv[1:]), os.getcwd())
+        sys.stdout.write(output)
+        sys.exit(status)
+    if args.profile:
+        import cProfile
+        profile = cProfile.Profile()
+        try:
+            profile.runcall(run, args)
+        finally:
+            profile.dump_stats(args.profile)
+    else:
+        run(args)
+
+
+def run(args):
+    if args.from_git:
+        unsupported = unsupported_options(args, ('root', 'template', 'from_git', 'profile'))
+        if unsupported:
+            print(f"Option(s) not supported with --from-git: {', '.join(unsupported)}")
+            sys.exit(2)
+        from documentary.git import verify_revision
+        verify_revision(args.root, args.template, args.from_git)
+        return
+    documentary_path, root_path, template, output_path = resolve_paths(args)
+    if args.watch:
+        from documentary.watch import watch
+        watch(documentary_path, root_path, template, output_path)
+        return
+    from documentary.details.details_cache import DetailsCache
+    from documentary.details.validation_cache import ValidationCache
+    from documentary.document import document_many
+    document_many(documentary_path, root_path, template, output_path, jobs=args.jobs, readers=args.readers, stats=args.stats,
+                  log_format=args.log_format,
+                  cache=path.join(root_path, args.cache) if args.cache else None,
+                  changed=args.changed,
+                  fsync=args.fsync,
+                  validation_cache=ValidationCache(path.join(root_path, args.validation_cache), args.trust_cache)
+                  if args.validation_cache else None,
+                  details_cache=DetailsCache(path.join(root_path, args.details_cache), args.trust_cache)
+                  if args.details_cache else None)
+
+
+def _without_server(argv: list) -> list:
+    arguments = []
+    skip = False
+    for index, argument in enumerate(argv):
+        if skip:
+            skip = False
+        elif argument == '--server':
+            # The socket is optional, so the next argument is the socket only if it isn't an option, nor the last one
+            skip = index + 1 < len(argv) and not argv[index + 1].startswith('-')
+        elif not argument.startswith('--server='):
+            arguments.append(argument)
+    return arguments
 
 
 if __name__ == '__main__':
@@ -2,7 +2,7 @@ import argparse
 import os
 
 
-def parse_args():
+def parse_args(argv: list = None):
     parser = argparse.ArgumentParser()
 
     parser.add_argument("root",
@@ -16,5 +16,122 @@ def parse_args():
                         required=True,
                         metavar="FILE")
 
-    return parser.parse_args()
+    parser.add_argument("--jobs",
+                        help="number of templates documented in parallel (default: 1)",
+                        type=positive_int,
+                        default=1,
+                        metavar="N")
 
+    parser.add_argument("--readers",
+                        help="number of threads reading templates and details ahead of documenting them (default: 4)",
+                        type=positive_int,
+                        default=4,
+                        metavar="N")
+
+    parser.add_argument("--cache",
+                        help="skip templates whose inputs haven't changed since the last run, recorded in a manifest "
+                             "(default: .documentary-cache in the root folder)",
+                        nargs='?',
+                        const='.documentary-cache',
+                        metavar="FILE")
+
+    parser.add_argument("--changed",
+                        help="document only templates affected by the given edited files (implies --cache)",
+                        nargs='+',
+                        metavar="FILE")
+
+    parser.add_argument("--fsync",
+                        help="flush documented files to disk at the end of the run",
+                        action='store_true')
+
+    parser.add_argument("--validation-cache",
+                        help="skip validation of details which passed it before, recorded in a folder "
+                             "(default: .documentary-validated in the root folder)",
+                        nargs='?',
+                        const='.documentary-validated',
+                        metavar="DIR")
+
+    parser.add_argument("--details-cache",
+                        help="reuse details built from unchanged details files, stored in a folder "
+                             "(default: .documentary-details in the root folder)",
+                        nargs='?',
+                        const='.documentary-details',
+                        metavar="DIR")
+
+    parser.add_argument("--trust-cache",
+                        help="trust validation records and details created by other users, e.g. agents sharing "
+                             "the folders (implies --validation-cache)",
+                        action='store_true')
+
+    parser.add_argument("--stats",
+                        help="report time spent in every stage of documenting, in total and per template",
+                        action='store_true')
+
+    parser.add_argument("--log-format",
+                        help="report every template as a line of text, or as a JSON record followed by a summary record "
+                             "(default: text)",
+                        choices=['text', 'jsonl'],
+                        default='text')
+
+    parser.add_argument("--profile",
+                        help="profile the run with cProfile, and save the statistics of the main process to a file",
+                        metavar="FILE")
+
+    parser.add_argument("--from-git",
+                        help="document templates of a git revision in memory, and report templates which differ from "
+                             "their documentation, without checking out, nor writing files",
+                        metavar="REV")
+
+    parser.add_argument("--server",
+                        help="document with a server started with 'documentary serve', listening on a socket "
+                             "(default: documentary.sock in $XDG_RUNTIME_DIR, or in a folder of the user in the temporary directory)",
+                        nargs='?',
+                        const='',
+                        metavar="SOCKET")
+
+    parser.add_argument("--watch",
+                        help="watch documentary folder and templates, and document templates affected by changes",
+                        action='store_true')
+
+    args = parser.parse_args(argv)
+    if args.changed is not None and args.cache is None:
+        args.cache = '.documentary-cache'
+    if args.trust_cache and args.validation_cache is None:
+        args.validation_cache = '.documentary-validated'
+    if args.server == '':
+        args.server = default_socket()
+    return args
+
+
+def unsupported_options(args, supported: tuple) -> list:
+    # Options other than the supported ones are rejected when they're given, rather than silently ignored.
+    defaults = vars(parse_args(['--template', args.template]))
+    return [f"--{name.replace('_', '-')}" for name, value in vars(args).items() if name not in supported and value != defaults[name]]
+
+
+def parse_serve_args(argv: list = None):
+    parser = argparse.ArgumentParser(prog='documentary serve')
+    parser.add_argument("--socket",
+                        help="path of a socket to listen on (default: %(default)s)",
+                        default=default_socket(),
+                        metavar="SOCKET")
+    return parser.parse_args(argv)
+
+
+def positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {number}")
+    return number
+
+
+def default_socket() -> str:
+    # The socket is kept in a folder of the user, rather than directly in the temporary directory shared by all users.
+    runtime = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime:
+        return os.path.join(runtime, 'documentary.sock')
+    import tempfile
+    return os.path.join(tempfile.gettempdir(), f"documentary-{os.getuid() if hasattr(os, 'getuid') else 'user'}", 'documentary.sock')
@@ -0,0 +1,48 @@
+import os
+from typing import Iterable, Iterator, Mapping, Tuple, Union
+
+from .details.details_cache import DetailsCache
+from .details.preprocess_details import load_details_contents
+from .details.validation_cache import ValidationCache
+from .inputs import details_files
+from .placeholder import populate
+from .render_cache import RenderCache
+from .template import renderer
+
+
+def document_sources(templates: Iterable[Tuple[str, str]], documentary: Mapping[str, str], validation_cache: ValidationCache = None,
+                     details_cache: DetailsCache = None) -> Iterator[Tuple[str, str]]:
+    documenter = SourceDocumenter(documentary, validation_cache, details_cache)
+    for template, source in templates:
+        yield template, documenter.document(template, source)
+
+
+class SourceDocumenter:
+    # Templates are documented without reading or writing files. Files of documentary folder are given by paths
+    # relative to the folder (e.g. "src/Pattern.php/declaration.json" or "project/fragment/param.subject.html"),
+    # and templates by paths relative to the root. Rendered docblocks are shared by all the documented templates.
+    def __init__(self, documentary: Mapping[str, str], validation_cache: ValidationCache = None, details_cache: DetailsCache = None):
+        # Files are looked up in the mapping only once they're read, so a mapping may load them lazily.
+        self._documentary = documentary
+        self._names = {os.path.normpath(filename): filename for filename in documentary}
+        self._validation_cache = validation_cache
+        self._details_cache = details_cache
+        self._cache = RenderCache()
+
+    def document(self, template: str, source: str) -> str:
+        if 'documentary' not in source:
+            # Without the marker there are no placeholders, so details don't have to be loaded, nor validated.
+            return source
+        documentation_path = os.path.normpath(template)
+        contents = [_encoded(self._read(filename)) for filename in details_files(documentation_path)]
+        details, class_details = load_details_contents(contents, self._validation_cache, self._details_cache)
+        render = renderer(details, class_details, '', os.path.join(documentation_path, 'fragments'), True, self._read, self._cache)
+        return populate(source, render)
+
+    def _read(self, filename: str) -> Union[str, None]:
+        name = self._names.get(filename)
+        return None if name is None else self._documentary[name]
+
+
+def _encoded(content: Union[str, None]) -> Union[bytes, None]:
+    return None if content is None else content.encode('utf-8')
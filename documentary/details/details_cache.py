@@ -0,0 +1,38 @@
+import hashlib
+import os
+import pickle
+from typing import Union
+
+from documentary.details.validation_cache import trusted
+from documentary.manifest import tool_version
+from documentary.writer import Writer
+
+
+class DetailsCache:
+    # Built details are pickled into a file named after the hash of the tool version and the contents
+    # of the details files, so unchanged details are loaded with a single read, without being parsed,
+    # validated nor built again. Like validation records, pickles of other users are trusted only on request.
+    def __init__(self, directory: str, trust_others: bool = False):
+        self.directory = directory
+        self.trust_others = trust_others
+        self._writer = Writer()
+
+    def get(self, contents: list) -> Union[tuple, None]:
+        try:
+            with open(self._entry(contents), 'rb') as file:
+                if not trusted(os.fstat(file.fileno()), self.trust_others):
+                    return None
+                return pickle.load(file)
+        except (FileNotFoundError, pickle.UnpicklingError, EOFError, ValueError):
+            # A missing or corrupted entry is built again, and overwritten
+            return None
+
+    def put(self, contents: list, details: tuple) -> None:
+        self._writer.write(self._entry(contents), [pickle.dumps(details, pickle.HIGHEST_PROTOCOL)])
+
+    def _entry(self, contents: list) -> str:
+        digest = hashlib.sha1(tool_version().encode())
+        for content in contents:
+            digest.update(b'-' if content is None else b'%d:%s' % (len(content), content))
+        hexdigest = digest.hexdigest()
+        return os.path.join(self.directory, hexdigest[:2], hexdigest[2:] + '.pickle')
@@ -4,28 +4,60 @@ from collections import OrderedDict
 from typing import Tuple
 
 from documentary import validate
+from documentary.details.details_cache import DetailsCache
+from documentary.details.validation_cache import ValidationCache
+from documentary.files import read_binary_file
 from documentary.merge_utils import merge_dictionaries
+from documentary.stats import timed, count
 from documentary.utils import first
 
 
-def load_details(definitions: str, declaration: str, decorations: str) -> Tuple[dict, dict]:
-    decoration = _load_file_or_default(decorations)
-    details = build_details(_load_file_or_default(definitions), _load_file_or_default(declaration), decoration)
-    return details, decoration.get('class', {}) if decoration else {}
+def load_details(definitions: str, declaration: str, decorations: str, validation_cache: ValidationCache = None,
+                 details_cache: DetailsCache = None) -> Tuple[dict, dict]:
+    contents = [read_binary_file(definitions), read_binary_file(declaration), read_binary_file(decorations)]
+    return load_details_contents(contents, validation_cache, details_cache)
+
 
+def load_details_contents(contents: list, validation_cache: ValidationCache = None, details_cache: DetailsCache = None) -> Tuple[dict, dict]:
+    if details_cache is not None:
+        cached = details_cache.get(contents)
+        if cached is not None:
+            count('details cache hits')
+            return cached
+    details = _build_loaded(*contents, validation_cache)
+    if details_cache is not None:
+        details_cache.put(contents, details)
+    return details
 
-def _load_file_or_default(filename: str, default=None) -> dict:
-    try:
-        with open(filename) as file:
-            return json.load(file, object_pairs_hook=lambda pair: OrderedDict(pair))
-    except FileNotFoundError:
-        return default
+
+def _build_loaded(definitions: bytes, declaration: bytes, decorations: bytes, validation_cache: ValidationCache) -> Tuple[dict, dict]:
+    definition = _validated(definitions, 'definitions', validation_cache)
+    declarations = _validated(declaration, 'declarations', validation_cache)
+    decoration = _validated(decorations, 'decorations', validation_cache)
+    with timed('building'):
+        details = build_details(definition, declarations, decoration, validated=True)
+    return details, decoration.get('class', {}) if decoration else {}
 
 
-def build_details(summaries: dict = None, params: dict = None, links: dict = None) -> dict:
-    validate.definitions(summaries) if summaries else {}
-    validate.declarations(params) if params else {}
-    validate.decorations(links) if links else {}
+def _validated(content: bytes, kind: str, validation_cache: ValidationCache = None):
+    if content is None:
+        return None
+    with timed('json'):
+        detail = json.loads(content, object_pairs_hook=lambda pair: OrderedDict(pair))
+    if detail:
+        if validation_cache is None or not validation_cache.validated(kind, content):
+            with timed('validation'):
+                getattr(validate, kind)(detail)
+            if validation_cache is not None:
+                validation_cache.record(kind, content)
+    return detail
+
+
+def build_details(summaries: dict = None, params: dict = None, links: dict = None, validated: bool = False) -> dict:
+    if not validated:
+        validate.definitions(summaries) if summaries else {}
+        validate.declarations(params) if params else {}
+        validate.decorations(links) if links else {}
 
     dictionaries = merge_dictionaries(
         [build_params(params or {}), build_links(links or {}), build_summaries(summaries or {})], allow_override=False)
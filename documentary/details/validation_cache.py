@@ -0,0 +1,36 @@
+import hashlib
+import os
+
+from documentary.manifest import tool_version
+
+
+class ValidationCache:
+    # Every document which passed validation is recorded as an empty file, named after the hash of its
+    # content, kind and the tool version, so agents sharing the directory never need a lock. By default,
+    # only records created by the current user are trusted; trust_others trusts records of anyone.
+    def __init__(self, directory: str, trust_others: bool = False):
+        self.directory = directory
+        self.trust_others = trust_others
+
+    def validated(self, kind: str, content: bytes) -> bool:
+        try:
+            stat = os.stat(self._record(kind, content))
+        except FileNotFoundError:
+            return False
+        return trusted(stat, self.trust_others)
+
+    def record(self, kind: str, content: bytes) -> None:
+        record = self._record(kind, content)
+        os.makedirs(os.path.dirname(record), exist_ok=True)
+        try:
+            open(record, 'x').close()
+        except FileExistsError:
+            pass
+
+    def _record(self, kind: str, content: bytes) -> str:
+        digest = hashlib.sha1(f"{tool_version()}:{kind}:".encode() + content).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest[2:])
+
+
+def trusted(stat: os.stat_result, trust_others: bool) -> bool:
+    return trust_others or not hasattr(os, 'getuid') or stat.st_uid == os.getuid()
@@ -1,25 +1,333 @@
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from functools import partial
 from os import path
+from typing import Iterator, NamedTuple, Tuple, Union
 
-from .details.preprocess_details import load_details
-from .files import map_file
-from .folder import discover_templates
-from .template import bootstrap
+from .details.preprocess_details import load_details, load_details_contents
+from .details.details_cache import DetailsCache
+from .details.validation_cache import ValidationCache
+from .files import rewrite_file, rewrite_segments, read_file, contains, encoded_segments, mapped, ENCODING
+from .folder import iterate_templates
+from .inputs import DocumentInputs, details_files, read_document_inputs
+from .manifest import Fingerprints, load_manifest, fingerprints
+from .store import FragmentStore, Preloaded, preload
+from .placeholder import replacements
+from .render_cache import RenderCache
+from .log import create_log, report_template
+from .stats import Stats, count, recording, timed
+from .template import renderer
+from .writer import Writer, sync
 
 
-def document_many(documentary_path: str, root_path: str, templates_path: str, output_path: str) -> None:
-    for template in discover_templates(templates_path, root_path, documentary_path):
-        document(documentary_path,
-                 path.join(documentary_path, template),
-                 path.join(root_path, template),
-                 path.join(output_path, template))
+def document_many(documentary_path: str, root_path: str, templates_path: str, output_path: str, jobs: int = 1,
+                  cache: str = None, changed: list = None, fsync: bool = False, validation_cache: ValidationCache = None,
+                  details_cache: DetailsCache = None, readers: int = 4, stats: bool = False,
+                  log_format: str = 'text') -> None:
+    # Templates are documented in a pipeline: templates are discovered lazily, their inputs are read by a pool
+    # of `readers` threads, rendered by a pool of `jobs` processes, and written in order of discovery. Each stage
+    # runs at most a few templates ahead of the next one, so reading, rendering and writing overlap.
+    started = time.perf_counter()
+    log = create_log(log_format)
+    timing = stats or log.timed
+    run_stats = Stats() if stats else None
+    manifest = load_manifest(cache) if cache else None
+    templates = _timed_iteration(iterate_template_paths(documentary_path, root_path, templates_path, output_path), 'discovery', run_stats)
+    if changed is None:
+        tasks = (_Task(*template, bool(manifest and manifest.unchanged(template[2]))) for template in templates)
+    else:
+        tasks = (_Task(*template, False) for template in _affected_templates(templates, manifest, changed))
+    load = partial(load_details_contents, validation_cache=validation_cache, details_cache=details_cache)
+
+    failed = []
+    documented = []
+    template_stats = []
+    writer = Writer()
+    for task, read, rendered in _pipeline(documentary_path, tasks, jobs, readers, manifest is not None, load, timing):
+        if task.unchanged:
+            log.template(task.template_path, 'skipped')
+            continue
+        with recording(Stats() if timing else None) as task_stats:
+            with timed('writing'):
+                written, error = _write(task, read, rendered, writer)
+        if timing:
+            task_stats.merge(read.stats).merge(rendered and rendered.stats)
+            template_stats.append((task.template_path, task_stats))
+        if error is None:
+            log.template(task.template_path, 'documented' if written else 'unchanged', task_stats,
+                         rendered.placeholders if written else 0, rendered.changed_bytes if written else 0)
+            if written:
+                documented.append(task.output_path)
+            if manifest:
+                manifest.record(task.output_path, task.template_path, {**rendered.inputs, **fingerprints([task.output_path])})
+        else:
+            log.template(task.template_path, 'error', task_stats, error=error)
+            failed.append(task.template_path)
+            if manifest:
+                manifest.forget(task.output_path)
+
+    if fsync:
+        sync(documented)
+    if manifest:
+        manifest.save()
+    if stats:
+        for _, task_stats in template_stats:
+            run_stats.merge(task_stats)
+    log.close(time.perf_counter() - started, run_stats, template_stats)
+    if failed:
+        raise DocumentationException(f"Failed to document {len(failed)} file(s)")
+
+
+def template_paths(documentary_path: str, root_path: str, templates_path: str, output_path: str) -> list:
+    return list(iterate_template_paths(documentary_path, root_path, templates_path, output_path))
+
+
+def iterate_template_paths(documentary_path: str, root_path: str, templates_path: str, output_path: str) -> Iterator[tuple]:
+    for template in iterate_templates(templates_path, root_path, documentary_path):
+        yield path.join(documentary_path, template), path.join(root_path, template), path.join(output_path, template)
+
+
+def _affected_templates(templates: Iterator[tuple], manifest, changed: list) -> Iterator[tuple]:
+    if manifest is None:
+        raise ValueError("Documenting changed files requires a cache manifest")
+    affected = manifest.affected(changed)
+    # Templates which weren't documented before have unknown dependencies, so they're documented as well.
+    return (template for template in templates if path.abspath(template[2]) in affected or not manifest.recorded(template[2]))
+
+
+class _Task(NamedTuple):
+    documentation_path: str
+    template_path: str
+    output_path: str
+    unchanged: bool
+
+
+class _Read(NamedTuple):
+    inputs: Union[DocumentInputs, None]
+    error: Union[str, None]
+    stats: Union[Stats, None] = None
+
+
+class _Rendered(NamedTuple):
+    segments: Union[list, None]
+    inputs: Union[dict, None]
+    error: Union[str, None]
+    stats: Union[Stats, None] = None
+    version: Union[tuple, None] = None
+    placeholders: int = 0
+    changed_bytes: int = 0
+
+
+def _write(task: _Task, read: _Read, rendered: _Rendered, writer: Writer) -> Tuple[bool, Union[str, None]]:
+    if read.error is not None:
+        return False, read.error
+    if rendered.error is not None:
+        return False, rendered.error
+
+    def segments(content, version: tuple) -> list:
+        # The template is mapped again to be written, so segments rendered from another version don't apply.
+        if version != rendered.version:
+            raise DocumentationException(f"File \"{task.template_path}\" changed while it was documented")
+        return rendered.segments
+
+    try:
+        written = rewrite_segments(task.template_path, task.output_path, segments, writer)
+    except Exception as exception:
+        return False, str(exception)
+    if written:
+        _, size = rendered.version
+        count('templates written')
+        count('bytes written', size + sum(len(segment) - (end - start) for start, end, segment in rendered.segments))
+    return written, None
+
+
+def _replaced(content, segments: list) -> list:
+    # Placeholders whose docblock is the same as in the template aren't replaced.
+    return [segment for start, end, segment in segments if segment != content[start:end]]
+
+
+def _timed_iteration(iterator: Iterator, stage: str, stats: Union[Stats, None]) -> Iterator:
+    while True:
+        with recording(stats), timed(stage):
+            item = next(iterator, None)
+        if item is None:
+            return
+        yield item
+
+
+def _pipeline(documentary_path: str, tasks: Iterator[_Task], jobs: int, readers: int, fingerprint: bool, load: callable, stats: bool):
+    preloaded = preload(path.join(documentary_path, 'project'))
+    with ExitStack() as stack:
+        # Workers are started before reading threads, so they're never forked from a process with other threads running.
+        if jobs > 1:
+            rendering = stack.enter_context(_render_pool(jobs, preloaded))
+            render = _render_in_worker
+        else:
+            rendering = None
+            render = partial(_render_safely, shared=_Shared(FragmentStore(preloaded), RenderCache(), Fingerprints()))
+        reading = stack.enter_context(ThreadPoolExecutor(max_workers=readers))
+        probing = stack.enter_context(ThreadPoolExecutor(max_workers=readers * 4))
+        reads = _ordered(((task, None if task.unchanged else task) for task in tasks), partial(_read_safely, executor=probing, stats=stats),
+                         reading, readers * 2)
+        renders = _ordered((((task, read), _render_arguments(documentary_path, task, read, fingerprint, load, stats)) for task, read in reads),
+                           render, rendering, jobs * 2)
+        for (task, read), rendered in renders:
+            yield task, read, rendered
+
+
+def _render_arguments(documentary_path: str, task: _Task, read: _Read, fingerprint: bool, load: callable, stats: bool) -> Union[tuple, None]:
+    if read is None or read.error is not None:
+        return None
+    return documentary_path, task.documentation_path, task.template_path, read.inputs, fingerprint, load, stats
+
+
+def _ordered(items: Iterator[tuple], function: callable, executor, depth: int):
+    # Yields (item, function(argument)) in order of items, with at most `depth` arguments submitted ahead.
+    # Items without argument pass through with None, and without executor, functions are called in place.
+    pending = deque()
+    for item, argument in items:
+        pending.append((item, _submit(executor, function, argument)))
+        if len(pending) >= depth:
+            yield _completed(*pending.popleft())
+    while pending:
+        yield _completed(*pending.popleft())
+
+
+def _submit(executor, function: callable, argument) -> Future:
+    if argument is not None and executor is not None:
+        return executor.submit(function, argument)
+    future = Future()
+    future.set_result(None if argument is None else function(argument))
+    return future
+
+
+def _completed(item, future: Future) -> tuple:
+    return item, future.result()
+
+
+def _read_safely(task: _Task, executor: Executor, stats: bool = False) -> _Read:
+    with recording(Stats() if stats else None) as read_stats, timed('reading'):
+        try:
+            # Without the marker there are no placeholders, so details don't have to be loaded, nor validated.
+            inputs = read_document_inputs(task.documentation_path, executor) if contains(task.template_path, b'documentary') else None
+        except Exception as error:
+            return _Read(None, str(error), read_stats)
+    return _Read(inputs, None, read_stats)
+
+
+class _Shared(NamedTuple):
+    store: FragmentStore
+    render_cache: RenderCache
+    fingerprints: Fingerprints
+
+
+_preloaded = None
+_worker_shared = None
+
+
+@contextmanager
+def _render_pool(jobs: int, preloaded: Preloaded) -> Iterator[ProcessPoolExecutor]:
+    # Forked workers inherit the preloaded project folder without copying it; workers started
+    # any other way read project fragments on demand.
+    global _preloaded
+    _preloaded = preloaded
+    try:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            # Forked workers are all started by the first task, which is awaited.
+            executor.submit(int).result()
+            yield executor
+    finally:
+        _preloaded = None
+
+
+def _render_in_worker(arguments: tuple) -> _Rendered:
+    # Each worker process keeps its own store, rendered docblocks and fingerprints, shared by all the templates it renders.
+    global _worker_shared
+    if _worker_shared is None:
+        _worker_shared = _Shared(FragmentStore(_preloaded), RenderCache(), Fingerprints())
+    return _render_safely(arguments, _worker_shared)
+
+
+def _render_safely(arguments: tuple, shared: _Shared) -> _Rendered:
+    documentary_path, documentation_path, template_path, document_inputs, fingerprint, load, stats = arguments
+    with recording(Stats() if stats else None) as render_stats:
+        try:
+            # Workers map templates themselves, so a template is never read into memory, nor sent between processes;
+            # only the rendered segments are, and the template is mapped again to be written.
+            with mapped(template_path) as (content, version):
+                if document_inputs is None:
+                    segments, inputs = [], [template_path]
+                else:
+                    reads = []
+                    read = _recording(reads, _timed_read(document_inputs.reader(shared.store.read)))
+                    with timed('details'):
+                        loaded = load(document_inputs.details)
+                    render = _timed_render(_renderer(documentary_path, documentation_path, loaded, read, shared.render_cache))
+                    with timed('scanning'):
+                        segments = encoded_segments(content, lambda content: replacements(content, render, ENCODING))
+                    inputs = [template_path, *details_files(documentation_path), *reads]
+                replaced = _replaced(content, segments)
+            count('placeholders replaced', len(replaced))
+            with timed('fingerprints'):
+                fingerprinted = shared.fingerprints(inputs) if fingerprint else None
+        except Exception as error:
+            # Exceptions are reported as text, since not every exception (e.g. SchemaError) survives pickling between processes.
+            return _Rendered(None, None, str(error), render_stats)
+    return _Rendered(segments, fingerprinted, None, render_stats, version, len(replaced), sum(map(len, replaced)))
+
+
+def _timed_read(read: callable) -> callable:
+    def timed_read(filename: str) -> Union[str, None]:
+        with timed('fragments'):
+            content = read(filename)
+        count('fragment hits' if content is not None else 'fragment misses')
+        return content
+
+    return timed_read
+
+
+def _timed_render(render: callable) -> callable:
+    def timed_render(method_name: str, indent: int, placeholder: str) -> Union[str, None]:
+        with timed('rendering'):
+            return render(method_name, indent, placeholder)
+
+    return timed_render
 
 
 def document(documentary_path: str, documentation_path: str, template_path: str, output_path: str) -> None:
-    details, class_details = load_details(
-        path.join(documentation_path, 'definition.json'),
-        path.join(documentation_path, 'declaration.json'),
-        path.join(documentation_path, 'decoration.json'))
+    documented, _ = document_template(documentary_path, documentation_path, template_path, output_path)
+    report_template(template_path, documented)
+
+
+def document_template(documentary_path: str, documentation_path: str, template_path: str, output_path: str,
+                      read: callable = read_file, load: callable = load_details, writer: Writer = None,
+                      render_cache: RenderCache = None) -> Tuple[bool, list]:
+    # Documents a single template, and returns whether it was written, and the files it was documented from.
+    if not contains(template_path, b'documentary'):
+        # Without the marker there are no placeholders, so details don't have to be loaded, nor validated.
+        return rewrite_file(template_path, output_path, lambda content: iter(()), writer), [template_path, output_path]
+
+    details = details_files(documentation_path)
+    reads = []
+    render = _renderer(documentary_path, documentation_path, load(*details), _recording(reads, read), render_cache)
+    documented = rewrite_file(template_path, output_path, lambda content: replacements(content, render, ENCODING), writer)
+    return documented, [template_path, output_path, *details, *reads]
+
+
+def _renderer(documentary_path: str, documentation_path: str, loaded: tuple, read: callable, render_cache: RenderCache) -> callable:
+    details, class_details = loaded
+    return renderer(details, class_details, documentary_path, path.join(documentation_path, 'fragments'), True, read, render_cache)
+
+
+def _recording(reads: list, read: callable) -> callable:
+    def recording_read(filename: str) -> Union[str, None]:
+        reads.append(filename)
+        return read(filename)
+
+    return recording_read
 
-    documented = map_file(template_path, output_path, bootstrap(details, class_details, documentary_path, path.join(documentation_path, 'fragments'), True))
 
-    print(('File "{}" documented' if documented else 'File "{}" remains unchanged').format(template_path))
+class DocumentationException(Exception):
+    pass
@@ -1,54 +1,131 @@
+import locale
+import mmap
 import os
+from contextlib import contextmanager
+from typing import Iterator, Union
 
+from .writer import Writer, digest, file_digest
 
-def map_file(filename: str, output: str, mapper: callable) -> bool:
-    with open(filename, "r") as file:
-        content = file.read()
+ENCODING = locale.getpreferredencoding(False)
+_CHUNK = 1 << 20
 
-    _create_directory_for_file(output)
-    new_content = mapper(content)
-    if new_content == content:
-        return False
-    with open(output, "w+") as file:
-        file.write(new_content)
+
+def rewrite_file(filename: str, output: str, replacements: callable, writer: Writer = None) -> bool:
+    return rewrite_segments(filename, output, lambda content, version: encoded_segments(content, replacements), writer)
+
+
+def rewrite_segments(filename: str, output: str, segments: callable, writer: Writer = None) -> bool:
+    # The template is memory-mapped, and only the replaced segments are rendered into memory; unchanged
+    # ranges are copied. If the output is another file, it's written only if its content is different.
+    # The output replaces the template only once it's closed, since open files can't be replaced on Windows.
+    writer = writer or Writer()
+    with mapped(filename) as (content, version):
+        written = _written_segments(filename, output, content, segments(content, version))
+        if written is None:
+            return False
+        temporary = writer.stage(output, _chunks(content, written))
+    writer.commit(temporary, output)
     return True
 
 
-def _create_directory_for_file(path: str):
-    d = file_directory(path)
-    if not os.path.exists(d):
-        os.makedirs(d)
+@contextmanager
+def mapped(filename: str) -> Iterator[tuple]:
+    # Yields the mapped content, and its version: mtime and size of the file
+    with open(filename, "rb") as file, _mapped(file) as content:
+        stat = os.fstat(file.fileno())
+        yield content, (stat.st_mtime_ns, stat.st_size)
+
+
+def encoded_segments(content, replacements: callable) -> list:
+    return [(start, end, replacement.encode(ENCODING)) for start, end, replacement in replacements(content)]
+
+
+def _written_segments(filename: str, output: str, content, segments: list) -> Union[list, None]:
+    if os.path.abspath(filename) == os.path.abspath(output):
+        segments = [(start, end, segment) for start, end, segment in segments if segment != content[start:end]]
+        return segments or None
+    if digest(_chunks(content, segments)) == file_digest(output):
+        return None
+    return segments
+
+
+@contextmanager
+def _mapped(file):
+    try:
+        content = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        # Empty files can't be mapped
+        yield b''
+        return
+    with content:
+        yield content
+
+
+def _chunks(content, segments: list):
+    position = 0
+    for start, end, segment in segments:
+        yield from _ranges(content, position, start)
+        yield segment
+        position = end
+    yield from _ranges(content, position, len(content))
+
+
+def _ranges(content, start: int, end: int):
+    for offset in range(start, end, _CHUNK):
+        yield content[offset:min(offset + _CHUNK, end)]
 
 
-def file_directory(path):
-    return os.path.dirname(os.path.abspath(path))
+def contains(filename: str, marker: bytes) -> bool:
+    with open(filename, "rb") as file:
+        try:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                return content.find(marker) != -1
+        except ValueError:
+            # Empty files can't be mapped
+            return False
 
 
-def fragment_fallback(path: str, filename: str, second_filename: str, documentary_path: str) -> str:
+def read_binary_file(path: str) -> Union[bytes, None]:
+    try:
+        with open(path, "rb") as file:
+            return file.read()
+    except FileNotFoundError:
+        return None
+
+
+def read_file(path: str) -> Union[str, None]:
+    try:
+        with open(path, "r") as file:
+            return file.read()
+    except FileNotFoundError:
+        return None
+
+
+def fragment_fallback(path: str, filename: str, second_filename: str, documentary_path: str, read: callable = read_file) -> str:
     project_param = lambda: __fragment_or(
         path=os.path.join(documentary_path, 'project', 'fragment'),
         filename=second_filename,
-        default=lambda: '')
-    class_param = lambda: __fragment_or(path, second_filename, project_param)
-    method_param = lambda: __fragment_or(path, filename, class_param)
+        default=lambda: '',
+        read=read)
+    class_param = lambda: __fragment_or(path, second_filename, project_param, read)
+    method_param = lambda: __fragment_or(path, filename, class_param, read)
     return method_param()
 
 
-def fragment(path: str, filename: str, default: callable = None) -> str:
+def fragment(path: str, filename: str, default: callable = None, read: callable = read_file) -> str:
     def missing_fragment():
         if default:
             return default()
         raise MissingFragmentException(filename)
 
-    return __fragment_or(path, filename, missing_fragment)
+    return __fragment_or(path, filename, missing_fragment, read)
 
 
-def __fragment_or(path: str, filename: str, default: callable) -> str:
-    try:
-        with open(os.path.join(path, filename + ".html"), "r") as file:
-            return file.read()
-    except FileNotFoundError:
+def __fragment_or(path: str, filename: str, default: callable, read: callable) -> str:
+    content = read(os.path.join(path, filename + ".html"))
+    if content is None:
         return default()
+    return content
 
 
 class MissingFragmentException(Exception):
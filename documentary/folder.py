@@ -1,42 +1,61 @@
 import os
 from os import path
-from pathlib import Path
+from typing import Iterator
 
 
 def discover_templates(folder: str, root: str, documentary: str) -> list:
-    absolute = path.join(root, folder)
-    if path.isfile(absolute):
-        return [folder]
-    if path.isdir(absolute):
-        return [strip(f, documentary) for f in template_files(folder, root, documentary)]
-    raise FileNotFoundError(f"File/folder '{folder}' does not exist")
+    return list(iterate_templates(folder, root, documentary))
 
 
-def template_files(folder: str, root: str, documentary: str) -> list:
-    return [filename for filename in folders(folder, documentary) if path.isfile(path.join(root, strip(filename, documentary)))]
+def iterate_templates(folder: str, root: str, documentary: str) -> Iterator[str]:
+    absolute = path.join(root, folder)
+    if path.isfile(absolute):
+        yield folder
+    elif path.isdir(absolute):
+        yield from template_files(path.normpath(folder), root, documentary)
+    else:
+        raise FileNotFoundError(f"File/folder '{folder}' does not exist")
 
 
-def folders(folder: str, documentary: str) -> list:
-    parent = path.join(documentary, folder)
+def template_files(folder: str, root: str, documentary: str) -> Iterator[str]:
+    # A template is a file in root, documented by a folder of the same relative path in documentary. Both
+    # trees are walked side by side with a single listing of each folder, and only folders existing
+    # in both of them are entered, since there can be no templates in the rest.
     try:
-        return [parent, *deep_scandir(parent)]
+        documented = _listing(path.join(documentary, folder))
     except FileNotFoundError:
         raise TemplatesDiscoveryException(f"File/folder '{folder}' is not documented")
-
-
-def deep_scandir(root):
-    result = [f.path for f in os.scandir(root) if f.is_dir()]
-    for root in list(result):
-        result.extend(deep_scandir(root))
-    return result
-
-
-def strip(string: str, prefix: str) -> str:
-    parent = Path(prefix)
-    son = Path(string)
-    if parent in son.parents:
-        return str(son.relative_to(parent))
-    raise Exception()
+    stack = [(folder, documented)]
+    while stack:
+        relative, documented = stack.pop()
+        files, directories = _split(path.join(root, relative))
+        entered = []
+        for name in documented:
+            child = name if relative == '.' else path.join(relative, name)
+            if name in files:
+                yield child
+            elif name in directories:
+                entered.append(child)
+        stack.extend((child, _listing(path.join(documentary, child))) for child in reversed(entered))
+
+
+def _listing(directory: str) -> list:
+    with os.scandir(directory) as entries:
+        return [entry.name for entry in entries if entry.is_dir()]
+
+
+def _split(directory: str) -> tuple:
+    files, directories = set(), set()
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    directories.add(entry.name)
+                elif entry.is_file():
+                    files.add(entry.name)
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+    return files, directories
 
 
 class TemplatesDiscoveryException(Exception):
@@ -1,6 +1,6 @@
 from typing import Union
 
-from .markup import replace_template_strings
+from .markup import replace_line_template_strings
 from .utils import interlace
 
 
@@ -11,16 +11,11 @@ def format_comment(details: dict,
                    template_tag: Union[str, None],
                    indent: int) -> str:
     sections = render_comment_as_parts(details, format_method, template_tag, param_mapper, definition_fallback)
-
-    return replace_template_strings(
-        string=__comment_as_lines(__join_sections(sections), indent),
-        tag=lambda x: 'i' if x in details['param'] else 'b')
+    return __comment_as_lines(__join_sections(sections), indent, frozenset(details['param']))
 
 
 def format_sections_comment(sections: [], indent: int) -> str:
-    return replace_template_strings(
-        string=__comment_as_lines(__join_sections(sections), indent),
-        tag=lambda x: 'b')
+    return __comment_as_lines(__join_sections(sections), indent, frozenset())
     # Currently, we don't have access to the parameters of all methods,
     # so we can't distinguish which markup is a parameter and which isn't.
     # We're changing `each` to <b>mapped</b>, by default.
@@ -140,17 +135,11 @@ def __with_suffix(text: str, suffix: str) -> str:
     return text if text.endswith(suffix) else text + suffix
 
 
-def __comment_as_lines(lines: list, indent) -> str:
-    return "\n".join(__indented_comment(lines, indent))
-
-
-def __indented_comment(lines: list, indent: int) -> list:
-    return [indent * ' ' + line for line in __unindented_comment(lines)]
-
-
-def __unindented_comment(lines: list) -> list:
-    return [
-        "/**",
-        *((" * " + line).rstrip(' ') for line in lines),
-        " */"
-    ]
+def __comment_as_lines(lines: list, indent: int, italic: frozenset) -> str:
+    # Markup is replaced line by line, while the docblock is joined, in italic for parameters and bold otherwise.
+    prefix = indent * ' '
+    return "\n".join([
+        prefix + "/**",
+        *(prefix + (" * " + replace_line_template_strings(line, italic)).rstrip(' ') for line in lines),
+        prefix + " */"
+    ])
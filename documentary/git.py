@@ -0,0 +1,111 @@
+import subprocess
+from collections.abc import Mapping
+from os import path
+from typing import Iterator, Tuple
+
+from .batch import SourceDocumenter
+from .document import DocumentationException
+from .files import ENCODING
+from .folder import TemplatesDiscoveryException
+from .log import report_failure, report_verified
+
+
+def verify_revision(root_path: str, templates_path: str, revision: str) -> None:
+    # Templates and documentary folder are read from a git tree with a single "git cat-file --batch" process,
+    # documented in memory, and compared with the committed templates, so nothing is checked out, nor written.
+    blobs = dict(tree(root_path, revision))
+    documentary = {name[len('documentary/'):]: blob for name, blob in blobs.items() if name.startswith('documentary/')}
+    templates = revision_templates(blobs, documentary, path.normpath(templates_path).replace(path.sep, '/'), revision)
+    # Only details and fragments are read by templates, so other files (e.g. .DS_Store) aren't read at all.
+    documentation = {name: blob for name, blob in documentary.items() if name.endswith(('.json', '.html'))}
+    contents = read_blobs(root_path, [*documentation.values(), *(blobs[template] for template in templates)])
+    documenter = SourceDocumenter(_Decoded(documentation, contents))
+
+    outdated, failed = 0, 0
+    for template in templates:
+        template_path = path.join(root_path, template)
+        source = contents[blobs[template]].decode(ENCODING, 'surrogateescape')
+        try:
+            documented = documenter.document(template, source)
+        except Exception as error:
+            report_failure(template_path, str(error))
+            failed += 1
+            continue
+        report_verified(template_path, documented == source)
+        if documented != source:
+            outdated += 1
+    if failed:
+        raise DocumentationException(f"Failed to document {failed} file(s)")
+    if outdated:
+        raise DocumentationException(f"{outdated} file(s) differ from their documentation in {revision}")
+
+
+def revision_templates(blobs: dict, documentary: dict, templates_path: str, revision: str) -> list:
+    # As in the working tree, a template is a file documented by a folder of the same relative path in documentary.
+    # Git doesn't track empty folders, so only folders with any files count.
+    documented = set()
+    for name in documentary:
+        while '/' in name:
+            name = name.rsplit('/', 1)[0]
+            documented.add(name)
+    if templates_path == '.':
+        candidates = list(blobs)
+    elif templates_path in blobs:
+        candidates = [templates_path]
+    elif any(name.startswith(templates_path + '/') for name in blobs):
+        candidates = [name for name in blobs if name.startswith(templates_path + '/')]
+    else:
+        raise FileNotFoundError(f"File/folder '{templates_path}' does not exist in {revision}")
+    if templates_path != '.' and templates_path not in documented:
+        raise TemplatesDiscoveryException(f"File/folder '{templates_path}' is not documented")
+    return sorted(name for name in candidates if name in documented)
+
+
+def tree(root_path: str, revision: str) -> Iterator[Tuple[str, str]]:
+    # Paths are relative to the root, since git lists a tree relative to the working directory.
+    listing = subprocess.run(['git', 'ls-tree', '-r', '-z', revision], cwd=root_path, stdout=subprocess.PIPE, check=True).stdout
+    for entry in listing.split(b'\0'):
+        if entry:
+            info, name = entry.split(b'\t', 1)
+            _, kind, blob = info.split(b' ')
+            if kind == b'blob':
+                yield name.decode('utf-8', 'surrogateescape'), blob.decode()
+
+
+def read_blobs(root_path: str, blobs: list) -> dict:
+    # Each object is answered with a header "<object> <type> <size>", its content and a newline.
+    requested = list(dict.fromkeys(blobs))
+    output = subprocess.run(['git', 'cat-file', '--batch'], cwd=root_path, input=''.join(f'{blob}\n' for blob in requested).encode(),
+                            stdout=subprocess.PIPE, check=True).stdout
+    contents = {}
+    position = 0
+    for blob in requested:
+        header_end = output.index(b'\n', position)
+        header = output[position:header_end].split(b' ')
+        if header[1] == b'missing':
+            raise FileNotFoundError(f"Object {blob} is missing")
+        size = int(header[2])
+        contents[blob] = output[header_end + 1:header_end + 1 + size]
+        position = header_end + 1 + size + 1
+    return contents
+
+
+class _Decoded(Mapping):
+    # Files are decoded when they're read, so a file which can't be decoded fails only the templates using it.
+    def __init__(self, blobs: dict, contents: dict):
+        self._blobs = blobs
+        self._contents = contents
+
+    def __getitem__(self, name: str) -> str:
+        return _text(self._contents[self._blobs[name]])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._blobs)
+
+    def __len__(self) -> int:
+        return len(self._blobs)
+
+
+def _text(content: bytes) -> str:
+    # Documentary files are read as text files are, with universal newlines.
+    return content.decode(ENCODING).replace('\r\n', '\n').replace('\r', '\n')
@@ -0,0 +1,72 @@
+import asyncio
+import os
+from concurrent.futures import Executor
+from typing import NamedTuple, Union
+
+from .files import read_binary_file, read_file
+
+
+class DocumentInputs(NamedTuple):
+    details: list
+    fragments_path: str
+    fragments: dict
+    undecodable: frozenset = frozenset()
+
+    def reader(self, fallback: callable) -> callable:
+        # Fragments of the template were all read up front, so a fragment missing from them doesn't exist.
+        # Fragments which couldn't be decoded are read again, so they fail only if the template uses them.
+        def read(filename: str) -> Union[str, None]:
+            directory, name = os.path.split(filename)
+            if directory == self.fragments_path and name not in self.undecodable:
+                return self.fragments.get(name)
+            return fallback(filename)
+
+        return read
+
+
+def read_document_inputs(documentation_path: str, executor: Executor = None) -> DocumentInputs:
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(load_document_inputs(documentation_path, executor))
+    finally:
+        loop.close()
+
+
+async def load_document_inputs(documentation_path: str, executor: Executor = None) -> DocumentInputs:
+    # Details files and the listing of fragments are requested at once, and then all the fragments at once,
+    # so reading inputs of a template takes two round-trips on filesystems with high latency.
+    loop = asyncio.get_event_loop()
+    fragments_path = os.path.join(documentation_path, 'fragments')
+    *details, names = await asyncio.gather(
+        *(loop.run_in_executor(executor, read_binary_file, filename) for filename in details_files(documentation_path)),
+        loop.run_in_executor(executor, _listing, fragments_path))
+    contents = await asyncio.gather(*(loop.run_in_executor(executor, _read_fragment, os.path.join(fragments_path, name)) for name in names))
+    fragments = dict(zip(names, contents))
+    undecodable = frozenset(name for name, content in fragments.items() if content is _UNDECODABLE)
+    return DocumentInputs(details, fragments_path, {name: fragments[name] for name in fragments.keys() - undecodable}, undecodable)
+
+
+def details_files(documentation_path: str) -> list:
+    return [
+        os.path.join(documentation_path, 'definition.json'),
+        os.path.join(documentation_path, 'declaration.json'),
+        os.path.join(documentation_path, 'decoration.json'),
+    ]
+
+
+_UNDECODABLE = object()
+
+
+def _read_fragment(filename: str) -> object:
+    try:
+        return read_file(filename)
+    except UnicodeDecodeError:
+        return _UNDECODABLE
+
+
+def _listing(directory: str) -> list:
+    try:
+        with os.scandir(directory) as entries:
+            return [entry.name for entry in entries if entry.name.endswith('.html') and not entry.is_dir()]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
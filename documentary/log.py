@@ -0,0 +1,80 @@
+import json
+import sys
+from typing import Union
+
+from .stats import Stats, report
+
+
+def report_template(template_path: str, documented: bool) -> None:
+    print(('File "{}" documented' if documented else 'File "{}" remains unchanged').format(template_path))
+
+
+def report_verified(template_path: str, up_to_date: bool) -> None:
+    print(('File "{}" is up to date' if up_to_date else 'File "{}" differs from its documentation').format(template_path))
+
+
+def report_failure(template_path: str, error: str) -> None:
+    print(f'File "{template_path}" failed: {error}')
+
+
+def create_log(log_format: str):
+    if log_format == 'jsonl':
+        return JsonLinesLog()
+    if log_format == 'text':
+        return TextLog()
+    raise ValueError(f"Unknown log format '{log_format}'")
+
+
+class TextLog:
+    timed = False
+
+    def template(self, template_path: str, status: str, stats: Stats = None, placeholders: int = 0, bytes_changed: int = 0,
+                 error: str = None) -> None:
+        if status == 'error':
+            report_failure(template_path, error)
+        else:
+            report_template(template_path, status == 'documented')
+
+    def close(self, duration: float, stats: Union[Stats, None], templates: list) -> None:
+        if stats is not None:
+            for line in report(stats, templates):
+                print(line)
+
+
+class JsonLinesLog:
+    # A record per template, and a summary at the end. Records are written in batches, rather than a line at a time.
+    timed = True
+    _BATCH = 256
+
+    def __init__(self):
+        self._records = []
+        self._statuses = {}
+
+    def template(self, template_path: str, status: str, stats: Stats = None, placeholders: int = 0, bytes_changed: int = 0,
+                 error: str = None) -> None:
+        wall, cpu = stats.total() if stats else (0.0, 0.0)
+        record = {'template': template_path, 'status': status, 'duration': round(wall, 6), 'cpu': round(cpu, 6),
+                  'placeholders': placeholders, 'bytes_changed': bytes_changed}
+        if error is not None:
+            record['error'] = error
+        self._statuses[status] = self._statuses.get(status, 0) + 1
+        self._write(record)
+
+    def close(self, duration: float, stats: Union[Stats, None], templates: list) -> None:
+        summary = {'summary': True, 'templates': sum(self._statuses.values()), 'duration': round(duration, 6), **self._statuses}
+        if stats is not None:
+            summary['stages'] = {stage: {'duration': round(wall, 6), 'cpu': round(cpu, 6)} for stage, (wall, cpu) in stats.times.items()}
+            summary['counts'] = stats.counts
+        self._write(summary)
+        self._flush()
+
+    def _write(self, record: dict) -> None:
+        self._records.append(json.dumps(record))
+        if len(self._records) >= self._BATCH:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._records:
+            sys.stdout.write('\n'.join(self._records) + '\n')
+            sys.stdout.flush()
+            self._records = []
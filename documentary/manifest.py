@@ -0,0 +1,131 @@
+import hashlib
+import json
+import os
+from functools import lru_cache
+from typing import Union
+
+
+def load_manifest(filename: str) -> 'Manifest':
+    try:
+        with open(filename, 'r') as file:
+            content = json.load(file)
+    except (FileNotFoundError, ValueError):
+        return Manifest(filename, {})
+    if not isinstance(content, dict) or content.get('version') != tool_version():
+        return Manifest(filename, {})
+    return Manifest(filename, content.get('outputs', {}))
+
+
+class Manifest:
+    # Inputs are fingerprinted with [mtime, size, hash]; the content is only hashed again if mtime or size differ.
+    # Inputs that were looked up, but didn't exist, are recorded as None, so creating them invalidates the output.
+    def __init__(self, filename: str, outputs: dict):
+        self.filename = filename
+        self._outputs = outputs
+        self._modified = False
+
+    def unchanged(self, output: str) -> bool:
+        entry = self._outputs.get(os.path.abspath(output))
+        if entry is None:
+            return False
+        for filename, recorded in entry['inputs'].items():
+            current = _stat(filename)
+            if current is None or recorded is None:
+                if current != recorded:
+                    return False
+            elif current != recorded[:2]:
+                if _hash(filename) != recorded[2]:
+                    return False
+                entry['inputs'][filename] = [*current, recorded[2]]
+                self._modified = True
+        return True
+
+    def recorded(self, output: str) -> bool:
+        return os.path.abspath(output) in self._outputs
+
+    def dependents(self) -> dict:
+        index = {}
+        for output, entry in self._outputs.items():
+            for filename in entry['inputs']:
+                index.setdefault(filename, set()).add(output)
+        return index
+
+    def affected(self, filenames: list) -> set:
+        index = self.dependents()
+        return {output for filename in filenames for output in index.get(os.path.abspath(filename), ())}
+
+    def record(self, output: str, template: str, inputs: dict) -> None:
+        self._outputs[os.path.abspath(output)] = {'template': os.path.abspath(template), 'inputs': inputs}
+        self._modified = True
+
+    def forget(self, output: str) -> None:
+        if self._outputs.pop(os.path.abspath(output), None) is not None:
+            self._modified = True
+
+    def save(self) -> None:
+        if not self._modified:
+            return
+        temporary = self.filename + '.tmp'
+        with open(temporary, 'w') as file:
+            json.dump({'version': tool_version(), 'outputs': self._outputs}, file)
+        os.replace(temporary, self.filename)
+        self._modified = False
+
+
+class Fingerprints:
+    # Inputs shared by many templates (e.g. project fragments) are hashed once per run; a file is hashed
+    # again only if its mtime or size differ.
+    def __init__(self):
+        self._hashes = {}
+
+    def __call__(self, filenames: list) -> dict:
+        return {filename: self.fingerprint(filename) for filename in map(os.path.abspath, filenames)}
+
+    def fingerprint(self, filename: str) -> Union[list, None]:
+        stat = _stat(filename)
+        if stat is None:
+            return None
+        key = (filename, *stat)
+        if key not in self._hashes:
+            self._hashes[key] = _hash(filename)
+        return [*stat, self._hashes[key]]
+
+
+def fingerprints(filenames: list) -> dict:
+    return {filename: fingerprint(filename) for filename in map(os.path.abspath, filenames)}
+
+
+def fingerprint(filename: str) -> Union[list, None]:
+    stat = _stat(filename)
+    if stat is None:
+        return None
+    return [*stat, _hash(filename)]
+
+
+def _stat(filename: str) -> Union[list, None]:
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _hash(filename: str) -> Union[str, None]:
+    try:
+        with open(filename, 'rb') as file:
+            return hashlib.sha1(file.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+@lru_cache(maxsize=None)
+def tool_version() -> str:
+    digest = hashlib.sha1()
+    package = os.path.dirname(os.path.abspath(__file__))
+    for directory, folders, files in os.walk(package):
+        folders.sort()
+        for name in sorted(files):
+            if name.endswith('.py'):
+                with open(os.path.join(directory, name), 'rb') as file:
+                    digest.update(file.read())
+    return digest.hexdigest()
@@ -8,5 +8,28 @@ def replace_template_strings(string: str, tag: callable) -> str:
     return re.sub(r"`([^`\n\r]+)`", repl, string)
 
 
+def replace_line_template_strings(line: str, italic: frozenset = frozenset()) -> str:
+    # Same as replace_template_strings() with names in italic tagged <i> and others <b>, but a line is
+    # split on backticks instead of matched with a callback for every span.
+    if '`' not in line:
+        return line
+    if '\n' in line or '\r' in line:
+        return replace_template_strings(line, lambda value: 'i' if value in italic else 'b')
+    parts = line.split('`')
+    result = [parts[0]]
+    index = 1
+    while index < len(parts):
+        value = parts[index]
+        if value and index + 1 < len(parts):
+            result.append(markup('i' if value in italic else 'b', value))
+            result.append(parts[index + 1])
+            index += 2
+        else:
+            result.append('`')
+            result.append(value)
+            index += 1
+    return ''.join(result)
+
+
 def markup(tag: str, value: str) -> str:
     return f"<{tag}>{value}</{tag}>"
@@ -14,7 +14,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 import json
-from collections import Mapping
+from collections.abc import Mapping
 
 
 def merge_dictionaries(dictionaries: list, allow_override: bool = True) -> dict:
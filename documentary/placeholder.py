@@ -1,21 +1,98 @@
 import re
+from typing import Iterator, NamedTuple, Pattern, Tuple, Union
+
+
+class Placeholder(NamedTuple):
+    start: int
+    end: int
+    prefix: str
+    placeholder: str
+    method: str
+
+
+class _Syntax(NamedTuple):
+    opening: Union[str, bytes]
+    closing: Union[str, bytes]
+    newline: Union[str, bytes]
+    comment: Union[str, bytes]
+    slash: Union[str, bytes]
+    head: Pattern
+
+
+_TEXT = _Syntax('/**', '*/', '\n', '#', '/', re.compile(
+    r"[\s*]*(?P<placeholder>(?:({)?)(?(2)@?|@)documentary(?(2):| )(?P<method>:class|\w+)(?(2)}))"))
+
+# Binary templates are scanned without decoding; any non-ASCII byte is accepted in method names.
+_BINARY = _Syntax(b'/**', b'*/', b'\n', b'#', b'/', re.compile(
+    rb"[\s*]*(?P<placeholder>(?:({)?)(?(2)@?|@)documentary(?(2):| )(?P<method>:class|[\w\x80-\xff]+)(?(2)}))"))
 
 
 def populate(template: str, replacement: callable) -> str:
-    def repl(match):
-        if '//' in match[1]:
-            return match[0]
-        if match['method']:
-            replace = replacement(match['method'], len(match[1]), match['placeholder'])
-            if type(replace) is str:
-                return replace
-            if replace is not None:
-                raise TypeError('Invalid replacement type')
-        return match[0]
-
-    return sub(template, repl)
-
-
-def sub(string: str, repl: callable) -> str:
-    pattern = r"^([^#\n]*)(?<!/)/\*\*[\s*]*(?P<placeholder>(?:({)?)(?(3)@?|@)documentary(?(3):| )(?P<method>:class|\w+)(?(3)})).*?\*/"
-    return re.sub(pattern, repl, string, flags=re.MULTILINE | re.DOTALL)
+    parts = []
+    position = 0
+    for start, end, replace in replacements(template, replacement):
+        parts.append(template[position:start])
+        parts.append(replace)
+        position = end
+    parts.append(template[position:])
+    return ''.join(parts)
+
+
+def replacements(template, replacement: callable, encoding: str = 'utf-8') -> Iterator[Tuple[int, int, str]]:
+    decode = (lambda text: text) if isinstance(template, str) else (lambda text: text.decode(encoding))
+    for match in placeholders(template):
+        prefix = decode(match.prefix)
+        if '//' in prefix:
+            continue
+        replace = replacement(decode(match.method), len(prefix), decode(match.placeholder))
+        if replace is None:
+            continue
+        if type(replace) is not str:
+            raise TypeError('Invalid replacement type')
+        yield match.start, match.end, replace
+
+
+def placeholders(template) -> Iterator[Placeholder]:
+    # A placeholder is a docblock, which starts with "documentary" marker, preceded on its line only by text
+    # that's not commented out with "#". Only lines with "/**" are inspected, and only a docblock with
+    # the marker is searched for its closing "*/". Placeholders are found in order and don't overlap.
+    syntax = _TEXT if isinstance(template, str) else _BINARY
+    position = 0
+    while True:
+        opening = template.find(syntax.opening, position)
+        if opening == -1:
+            return
+        line_start = template.rfind(syntax.newline, 0, opening) + 1
+        line_end = template.find(syntax.newline, opening)
+        if line_end == -1:
+            line_end = len(template)
+        match = None if line_start < position else _match_line(template, syntax, line_start, line_end)
+        if match is None:
+            position = line_end + 1
+        else:
+            yield match
+            position = match.end
+
+
+def _match_line(template, syntax: _Syntax, line_start: int, line_end: int) -> Union[Placeholder, None]:
+    comment = template.find(syntax.comment, line_start, line_end)
+    for opening in reversed(_openings(template, syntax, line_start, line_end if comment == -1 else comment)):
+        if opening > 0 and template[opening - 1:opening] == syntax.slash:
+            continue
+        head = syntax.head.match(template, opening + 3)
+        if head is None:
+            continue
+        closing = template.find(syntax.closing, head.end())
+        if closing == -1:
+            continue
+        return Placeholder(line_start, closing + 2, template[line_start:opening], head['placeholder'], head['method'])
+    return None
+
+
+def _openings(template, syntax: _Syntax, start: int, end: int) -> list:
+    openings = []
+    opening = template.find(syntax.opening, start, end)
+    while opening != -1:
+        openings.append(opening)
+        opening = template.find(syntax.opening, opening + 1, end)
+    return openings
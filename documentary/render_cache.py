@@ -0,0 +1,27 @@
+from collections import OrderedDict
+
+from .stats import count
+
+
+class RenderCache:
+    # Rendered docblocks keyed by everything they're rendered from, so identical methods of different
+    # classes are rendered once. The least recently used docblocks are evicted above maxsize.
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._rendered = OrderedDict()
+
+    def get(self, key: tuple, render: callable) -> str:
+        if key in self._rendered:
+            self.hits += 1
+            count('docblock hits')
+            self._rendered.move_to_end(key)
+            return self._rendered[key]
+        self.misses += 1
+        count('docblock misses')
+        rendered = render()
+        self._rendered[key] = rendered
+        if len(self._rendered) > self.maxsize:
+            self._rendered.popitem(last=False)
+        return rendered
@@ -0,0 +1,116 @@
+import io
+import json
+import os
+import socket
+import socketserver
+from contextlib import redirect_stderr, redirect_stdout
+from os import path
+
+from .args import parse_args, unsupported_options
+from .paths import resolve_paths
+from .watch import Session
+
+# A request is a JSON object of the client's arguments and working directory, and a response is a JSON object
+# of the exit status and the output the command would print. Both are sent as a single line.
+
+
+class Documenter:
+    # Sessions are kept per documented templates, so details, fragments and rendered docblocks stay in memory
+    # between requests. Before every request, files read before are checked for changes.
+    def __init__(self):
+        self._sessions = {}
+
+    def document(self, argv: list) -> int:
+        try:
+            args = parse_args(argv)
+        except SystemExit as exception:
+            return exception.code or 0
+        # Sessions document the templates of root and --template; any other option is rejected, rather than ignored.
+        unsupported = unsupported_options(args, ('root', 'template'))
+        if unsupported:
+            print(f"Option(s) not supported by the server: {', '.join(unsupported)}")
+            return 2
+        try:
+            documentary_path, root_path, template, output_path = resolve_paths(args)
+        except Exception as error:
+            print(error)
+            return 1
+        key = tuple(map(path.abspath, [documentary_path, root_path, output_path])) + (template,)
+        if key not in self._sessions:
+            self._sessions[key] = Session(*key[:2], template, key[2])
+        session = self._sessions[key]
+        session.refresh()
+        return 1 if session.update(None) else 0
+
+
+def serve(socket_path: str) -> None:
+    documenter = Documenter()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            request = json.loads(self.rfile.readline())
+            output = io.StringIO()
+            with redirect_stdout(output), redirect_stderr(output):
+                status = _in_directory(request['cwd'], lambda: documenter.document(request['args']))
+            self.wfile.write(json.dumps({'status': status, 'output': output.getvalue()}).encode() + b'\n')
+
+    _private_directory(path.dirname(path.abspath(socket_path)))
+    _remove_stale_socket(socket_path)
+    # The socket is created accessible only to the user, since any client can make the server write files.
+    umask = os.umask(0o177)
+    try:
+        server = socketserver.UnixStreamServer(socket_path, Handler)
+    finally:
+        os.umask(umask)
+    with server:
+        print(f'Listening on "{socket_path}"')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.remove(socket_path)
+
+
+def request(socket_path: str, argv: list, cwd: str) -> tuple:
+    # Arguments are sent to, and output is trusted from, only a server of the same user.
+    if not _owned(os.stat(socket_path)):
+        raise PermissionError(f'Socket "{socket_path}" belongs to another user')
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(socket_path)
+        connection.sendall(json.dumps({'args': argv, 'cwd': cwd}).encode() + b'\n')
+        with connection.makefile('rb') as response:
+            result = json.loads(response.readline())
+    return result['status'], result['output']
+
+
+def _in_directory(directory: str, call: callable):
+    # Requests are handled one at a time, so the working directory of the client can be borrowed.
+    previous = os.getcwd()
+    os.chdir(directory)
+    try:
+        return call()
+    finally:
+        os.chdir(previous)
+
+
+def _private_directory(directory: str) -> None:
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if not _owned(os.stat(directory)):
+        raise PermissionError(f'Directory "{directory}" of the socket belongs to another user')
+
+
+def _owned(stat: os.stat_result) -> bool:
+    return stat.st_uid == os.getuid()
+
+
+def _remove_stale_socket(socket_path: str) -> None:
+    if not path.exists(socket_path):
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        try:
+            connection.connect(socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.remove(socket_path)
+            return
+    raise OSError(f'Server is already listening on "{socket_path}"')
@@ -0,0 +1,95 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Union
+
+
+class Stats:
+    # Wall and CPU times of stages are exclusive: time spent in a nested stage counts only towards that stage.
+    def __init__(self):
+        self.times = {}
+        self.counts = {}
+
+    def add_time(self, stage: str, wall: float, cpu: float) -> None:
+        total_wall, total_cpu = self.times.get(stage, (0.0, 0.0))
+        self.times[stage] = (total_wall + wall, total_cpu + cpu)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counts[name] = self.counts.get(name, 0) + amount
+
+    def merge(self, other: Union['Stats', None]) -> 'Stats':
+        if other is not None:
+            for stage, (wall, cpu) in other.times.items():
+                self.add_time(stage, wall, cpu)
+            for name, amount in other.counts.items():
+                self.count(name, amount)
+        return self
+
+    def total(self) -> tuple:
+        return sum(wall for wall, _ in self.times.values()), sum(cpu for _, cpu in self.times.values())
+
+
+def report(stats: Stats, templates: list) -> list:
+    lines = ['Stage            wall [s]    cpu [s]']
+    for stage, (wall, cpu) in stats.times.items():
+        lines.append(f'{stage:<15}{wall:>10.3f}{cpu:>11.3f}')
+    lines.extend(f'{name}: {amount}' for name, amount in stats.counts.items())
+    lines.append('Template wall [s]    cpu [s]')
+    for template_path, template_stats in templates:
+        wall, cpu = template_stats.total()
+        lines.append(f'{wall:>17.3f}{cpu:>11.3f}  {template_path}')
+    return lines
+
+
+_local = threading.local()
+# Before Python 3.7, there's no CPU time of a thread, so CPU time of stages includes other threads of the process.
+_cpu_time = getattr(time, 'thread_time', time.process_time)
+
+
+@contextmanager
+def recording(stats: Union[Stats, None]) -> Iterator[Union[Stats, None]]:
+    # Stages timed in the current thread are recorded in stats, until the block ends.
+    previous = getattr(_local, 'frames', None), getattr(_local, 'stats', None)
+    _local.frames, _local.stats = ([] if stats is not None else None), stats
+    try:
+        yield stats
+    finally:
+        _local.frames, _local.stats = previous
+
+
+class _Timed:
+    def __init__(self, stage: str):
+        self._stage = stage
+
+    def __enter__(self) -> None:
+        # A frame is [wall, cpu, nested wall, nested cpu]
+        _local.frames.append([time.perf_counter(), _cpu_time(), 0.0, 0.0])
+
+    def __exit__(self, *exception) -> None:
+        started_wall, started_cpu, nested_wall, nested_cpu = _local.frames.pop()
+        wall, cpu = time.perf_counter() - started_wall, _cpu_time() - started_cpu
+        _local.stats.add_time(self._stage, wall - nested_wall, cpu - nested_cpu)
+        if _local.frames:
+            _local.frames[-1][2] += wall
+            _local.frames[-1][3] += cpu
+
+
+class _NotTimed:
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *exception) -> None:
+        pass
+
+
+_NOT_TIMED = _NotTimed()
+
+
+def timed(stage: str):
+    return _NOT_TIMED if getattr(_local, 'frames', None) is None else _Timed(stage)
+
+
+def count(name: str, amount: int = 1) -> None:
+    stats = getattr(_local, 'stats', None)
+    if stats is not None:
+        stats.count(name, amount)
@@ -0,0 +1,63 @@
+import os
+from typing import NamedTuple, Union
+
+from .files import read_file
+
+
+class Preloaded(NamedTuple):
+    listings: dict
+    contents: dict
+
+
+def preload(folder: str) -> Preloaded:
+    # Project fragments and snippets are used by most templates, so they're read up front. Other files
+    # (e.g. .DS_Store) are only listed, and fragments which can't be decoded are left to fail when they're read.
+    listings = {}
+    contents = {}
+    for directory, _, filenames in os.walk(folder):
+        listings[directory] = frozenset(filenames)
+        for name in filenames:
+            if name.endswith('.html'):
+                filename = os.path.join(directory, name)
+                try:
+                    contents[filename] = read_file(filename)
+                except UnicodeDecodeError:
+                    pass
+    return Preloaded(listings, contents)
+
+
+class FragmentStore:
+    # Every directory is listed once, so fragments missing from the listing are answered without a syscall,
+    # and the fragments which exist are read once and then served from memory.
+    def __init__(self, preloaded: Preloaded = None):
+        self._listings = dict(preloaded.listings) if preloaded else {}
+        self._contents = dict(preloaded.contents) if preloaded else {}
+
+    def read(self, filename: str) -> Union[str, None]:
+        if filename in self._contents:
+            return self._contents[filename]
+        directory, name = os.path.split(filename)
+        if name not in self._listing(directory):
+            return None
+        content = read_file(filename)
+        self._contents[filename] = content
+        return content
+
+    def invalidate(self, filename: str) -> None:
+        # A changed file invalidates the listing of its folder, and a changed folder its own listing.
+        self._contents.pop(filename, None)
+        self._listings.pop(os.path.dirname(filename), None)
+        self._listings.pop(filename, None)
+
+    def _listing(self, directory: str) -> frozenset:
+        if directory not in self._listings:
+            self._listings[directory] = _scan(directory)
+        return self._listings[directory]
+
+
+def _scan(directory: str) -> frozenset:
+    try:
+        with os.scandir(directory) as entries:
+            return frozenset(entry.name for entry in entries if not entry.is_dir())
+    except (FileNotFoundError, NotADirectoryError):
+        return frozenset()
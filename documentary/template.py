@@ -1,38 +1,71 @@
+import errno
+import json
 import os
+from functools import lru_cache
 from typing import Union
 
-from .files import fragment_fallback, fragment
+from .files import fragment_fallback, fragment, read_file
 from .format_comment import format_comment, format_preg_method, format_sections_comment
 from .placeholder import populate
+from .render_cache import RenderCache
 
 
-def bootstrap(details: dict, class_details: dict, documentary: str, fragments: str, include_template_tag: bool) -> callable:
+def bootstrap(details: dict, class_details: dict, documentary: str, fragments: str, include_template_tag: bool,
+              read: callable = read_file, cache: RenderCache = None) -> callable:
+    repl = renderer(details, class_details, documentary, fragments, include_template_tag, read, cache)
+    return lambda template: populate(template, repl)
+
+
+def renderer(details: dict, class_details: dict, documentary: str, fragments: str, include_template_tag: bool,
+             read: callable = read_file, cache: RenderCache = None) -> callable:
     def repl(method_name: str, indent: int, placeholder: str):
         if method_name == ':class':
-            return class_comment(class_details, placeholder, indent, documentary)
+            return class_comment(class_details, placeholder, indent, documentary, read)
         if method_name not in details:
             return None
-        return details_as_comment(details, method_name, indent, documentary, fragments, placeholder if include_template_tag else None)
+        return details_as_comment(details, method_name, indent, documentary, fragments, placeholder if include_template_tag else None, read,
+                                  cache)
 
-    return lambda template: populate(template, repl)
+    return repl
 
 
-def class_comment(class_details: dict, placeholder: str, indent: int, documentary: str) -> str:
+def class_comment(class_details: dict, placeholder: str, indent: int, documentary: str, read: callable = read_file) -> str:
     snippet_path = os.path.join(documentary, 'project', 'snippet')
-    snippets = [load_snippet(snippet_path, snippet) for snippet in class_details['snippets']]
+    snippets = [load_snippet(snippet_path, snippet, read) for snippet in class_details['snippets']]
     return format_sections_comment([[placeholder], *snippets], indent=indent)
 
 
-def load_snippet(snippet_folder: str, snippet_name: str) -> list:
-    with open(os.path.join(snippet_folder, snippet_name + '.html')) as file:
-        return file.read().strip().split("\n")
+def load_snippet(snippet_folder: str, snippet_name: str, read: callable = read_file) -> list:
+    filename = os.path.join(snippet_folder, snippet_name + '.html')
+    content = read(filename)
+    if content is None:
+        raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), filename)
+    return list(_snippet_lines(content))
+
+
+@lru_cache(maxsize=256)
+def _snippet_lines(content: str) -> tuple:
+    return tuple(content.strip().split("\n"))
+
+
+def details_as_comment(details: dict, method_name: str, indent: int, documentary: str, fragments: str, include_template_tag: Union[str, None],
+                       read: callable = read_file, cache: RenderCache = None) -> str:
+    detail = details[method_name]
+    # Fragments are read up front, in the order of rendering, so the docblock can be looked up by their contents.
+    definition = fragment(fragments, f'method.{method_name}', default=lambda: '', read=read) if detail['definition'] is None else None
+    params = {p: fragment_fallback(fragments, f"{method_name}.param.{p}", f'param.{p}', documentary, read) for p in detail['param']}
 
+    def render() -> str:
+        return format_comment(
+            details=detail,
+            format_method=lambda x: format_preg_method(x) if x in details else x,
+            param_mapper=params.__getitem__,
+            definition_fallback=lambda: definition,
+            template_tag=include_template_tag,
+            indent=indent)
 
-def details_as_comment(details: dict, method_name: str, indent: int, documentary: str, fragments: str, include_template_tag: Union[str, None]) -> str:
-    return format_comment(
-        details=details[method_name],
-        format_method=lambda x: format_preg_method(x) if x in details else x,
-        param_mapper=lambda p: fragment_fallback(fragments, f"{method_name}.param.{p}", f'param.{p}', documentary),
-        definition_fallback=lambda: fragment(fragments, f'method.{method_name}', default=lambda: ''),
-        template_tag=include_template_tag,
-        indent=indent)
+    if cache is None:
+        return render()
+    key = (json.dumps(detail, default=repr), tuple(see in details for see in detail['see']), definition, tuple(params.values()),
+           include_template_tag, indent)
+    return cache.get(key, render)
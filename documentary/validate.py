@@ -1,21 +1,30 @@
+import json
 import re
+from functools import lru_cache
 
-from schema import Schema, Or, Optional, And, Use
+_PARAM_TYPE = re.compile(r"^(int|string|bool(ean)?|array|callable)(\[\])?$")
+_FLAG = re.compile(r"^([A-Z][A-Z0-9]+)(_[A-Z0-9]+)*$")
 
 
+# The schemas below are the specification of details. Documents are validated with the checks further below,
+# which accept exactly the same documents, but don't build and traverse the schemas for every document,
+# so the schema library is imported only by the schemas, and to report invalid documents.
+
 def definitions(detail: dict) -> dict:
-    return definitions_schema().validate(detail)
+    return _validated(detail, _valid_definitions, 'definition')
 
 
 def declarations(detail: dict) -> dict:
-    return declarations_schema().validate(detail)
+    return _validated(detail, _valid_declarations, 'declaration')
 
 
 def decorations(detail: dict) -> dict:
-    return decorations_schema().validate(detail)
+    return _validated(detail, _valid_decorations, 'decoration')
 
 
-def definitions_schema() -> Schema:
+@lru_cache(maxsize=None)
+def definitions_schema():
+    from schema import Schema, Or, Optional
     return Schema(Or({}, {
         str: {
             Optional("inherit"): str,
@@ -42,7 +51,9 @@ def _valid_param_array_declaration(declaration: list) -> bool:
     raise TypeError()
 
 
-def declarations_schema() -> Schema:
+@lru_cache(maxsize=None)
+def declarations_schema():
+    from schema import Schema, Or, Optional, And, Use
     return Schema(Or({}, {
         str: {
             Optional("inherit"): str,
@@ -78,14 +89,16 @@ def declarations_schema() -> Schema:
 
 
 def _valid_param_type(_type: str) -> bool:
-    return bool(re.match(r"^(int|string|bool(ean)?|array|callable)(\[\])?$", _type))
+    return bool(_PARAM_TYPE.match(_type))
 
 
 def __valid_flag(flag: str) -> bool:
-    return bool(re.match(r"^([A-Z][A-Z0-9]+)(_[A-Z0-9]+)*$", flag))
+    return bool(_FLAG.match(flag))
 
 
-def decorations_schema() -> Schema:
+@lru_cache(maxsize=None)
+def decorations_schema():
+    from schema import Schema, Or, Optional, And
     return Schema(Or({}, {
         Optional("class"): {
             Optional("snippets"): [str]
@@ -115,3 +128,141 @@ def decorations_schema() -> Schema:
             Optional("throws"): [str]
         })
     }))
+
+
+def _validated(detail: dict, valid: callable, name: str) -> dict:
+    if isinstance(detail, dict):
+        invalid = next((key for key, value in detail.items() if not valid(key, value)), None)
+        if invalid is None:
+            return detail
+        message = f"Invalid {name} of '{invalid}': {json.dumps(detail[invalid], default=repr)}"
+    else:
+        message = f"Invalid {name}s: {json.dumps(detail, default=repr)}"
+    from schema import SchemaError
+    raise SchemaError(message)
+
+
+def _dict_of(keys: dict, required: frozenset = frozenset()) -> callable:
+    def valid(value) -> bool:
+        if not isinstance(value, dict):
+            return False
+        for key, item in value.items():
+            check = keys.get(key)
+            if check is None or not check(item):
+                return False
+        return all(key in value for key in required)
+
+    return valid
+
+
+def _mapping_of(valid_item: callable, non_empty: bool = False) -> callable:
+    def valid(value) -> bool:
+        if not isinstance(value, dict) or (non_empty and not value):
+            return False
+        for key, item in value.items():
+            if not isinstance(key, str) or not valid_item(item):
+                return False
+        return True
+
+    return valid
+
+
+def _list_of(valid_item: callable, min_length: int = 0) -> callable:
+    def valid(value) -> bool:
+        return isinstance(value, list) and len(value) >= min_length and all(map(valid_item, value))
+
+    return valid
+
+
+def _either(*alternatives: callable) -> callable:
+    def valid(value) -> bool:
+        for alternative in alternatives:
+            if alternative(value):
+                return True
+        return False
+
+    return valid
+
+
+def _is_str(value) -> bool:
+    return isinstance(value, str)
+
+
+def _is_bool(value) -> bool:
+    return isinstance(value, bool)
+
+
+def _is_param_type(value) -> bool:
+    return isinstance(value, str) and _PARAM_TYPE.match(value) is not None
+
+
+def _is_flag(value) -> bool:
+    return isinstance(value, str) and _FLAG.match(value) is not None
+
+
+def _is_param_array_declaration(value) -> bool:
+    if not isinstance(value, list):
+        return False
+    try:
+        return bool(_valid_param_array_declaration(value))
+    except Exception:
+        return False
+
+
+_str_list = _list_of(_is_str)
+
+_definition = _dict_of({
+    "inherit": _is_str,
+    "definition": _is_str,
+    "return": _either(_is_str, _mapping_of(_dict_of({"when": _is_str, "return": _is_str}, required=frozenset({"when", "return"})))),
+    "const": _mapping_of(_is_str),
+})
+
+_param = _either(
+    _is_str,
+    _is_param_array_declaration,
+    _dict_of({}),
+    _dict_of({'bit-sum': _list_of(_is_flag, min_length=1)}, required=frozenset({'bit-sum'})),
+    _dict_of({
+        'type': _either(_is_param_type, _dict_of({
+            'type': lambda value: value == 'array',
+            'keys': _is_param_type,
+            'values': _is_param_type,
+        }, required=frozenset({'type', 'keys', 'values'}))),
+        'optional': _is_bool,
+        'ref': _is_bool,
+    }, required=frozenset({'type'})))
+
+_declaration = _dict_of({
+    "inherit": _is_str,
+    "param": _mapping_of(_param),
+    "template": _mapping_of(_either(_is_param_type, _list_of(_is_param_type)), non_empty=True),
+    "return-type": _either(_is_str, _str_list),
+})
+
+_decoration = {
+    "class": _dict_of({"snippets": _str_list}),
+    "methods": _mapping_of(_dict_of({
+        "see": _str_list,
+        "link": _str_list,
+        "manual": _mapping_of(lambda link: link is None or isinstance(link, str)),
+        "throws": _str_list,
+    })),
+    "groups": _dict_of({
+        "see": _list_of(_list_of(_is_str, min_length=2)),
+        "throws": _list_of(_dict_of({"methods": _str_list, "exceptions": _str_list}, required=frozenset({"methods", "exceptions"}))),
+    }),
+    "*": _dict_of({"see": _str_list, "link": _str_list, "throws": _str_list}),
+}
+
+
+def _valid_definitions(method, definition) -> bool:
+    return isinstance(method, str) and _definition(definition)
+
+
+def _valid_declarations(method, declaration) -> bool:
+    return isinstance(method, str) and _declaration(declaration)
+
+
+def _valid_decorations(key, value) -> bool:
+    return key in _decoration and _decoration[key](value)
@@ -0,0 +1,238 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from os import path
+from typing import Union
+
+from .details.preprocess_details import load_details
+from .document import template_paths, document_template
+from .folder import TemplatesDiscoveryException
+from .log import report_template, report_failure
+from .render_cache import RenderCache
+from .store import FragmentStore, preload
+from .writer import Writer
+
+
+def watch(documentary_path: str, root_path: str, templates_path: str, output_path: str, debounce: float = 0.2) -> None:
+    watcher = create_watcher([documentary_path, _templates_folder(root_path, templates_path)])
+    session = Session(documentary_path, root_path, templates_path, output_path)
+    try:
+        session.update(None)
+        while True:
+            changed = watcher.changes(None)
+            while True:
+                # Editors tend to save files in a few steps, so changes are collected until they quiet down.
+                more = watcher.changes(debounce)
+                if not more:
+                    break
+                changed |= more
+            session.update(changed)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
+def _templates_folder(root_path: str, templates_path: str) -> str:
+    folder = path.join(root_path, templates_path)
+    return folder if path.isdir(folder) else path.dirname(folder)
+
+
+class Session:
+    # Keeps loaded details and fragments between updates; only changed files are read again.
+    def __init__(self, documentary_path: str, root_path: str, templates_path: str, output_path: str):
+        self.documentary_path = path.abspath(documentary_path)
+        self.root_path = root_path
+        self.templates_path = templates_path
+        self.output_path = output_path
+        self._details = {}
+        project = path.join(self.documentary_path, 'project')
+        # Preloaded files are stated before they're read, so refresh() finds changes made in the meantime.
+        self._stats = _tree_stats(project)
+        self._fragments = FragmentStore(preload(project))
+        self._writer = Writer()
+        self._render_cache = RenderCache()
+        self._inputs = {}
+        self._written = {}
+
+    def update(self, changed: Union[set, None]) -> int:
+        if changed is not None:
+            changed = {filename for filename in map(path.abspath, changed) if not self._written_by_itself(filename)}
+            if not changed:
+                return 0
+            self._forget(changed)
+        try:
+            discovered = template_paths(self.documentary_path, self.root_path, self.templates_path, self.output_path)
+        except (FileNotFoundError, TemplatesDiscoveryException) as error:
+            print(error)
+            return 1
+        failed = 0
+        for documentation_path, template_path, output in discovered:
+            output = path.abspath(output)
+            if changed is not None and output in self._inputs and self._inputs[output].isdisjoint(changed):
+                continue
+            try:
+                documented, inputs = document_template(self.documentary_path, documentation_path, template_path, output, self._fragments.read,
+                                                       self._load, self._writer, self._render_cache)
+            except Exception as error:
+                self._inputs.pop(output, None)
+                report_failure(template_path, str(error))
+                failed += 1
+                continue
+            self._inputs[output] = set(map(path.abspath, inputs))
+            for filename in self._inputs[output]:
+                self._stats.setdefault(filename, _stat(filename))
+                self._stats.setdefault(path.dirname(filename), _stat(path.dirname(filename)))
+            if documented:
+                self._written[output] = _stat(output)
+                self._stats[output] = self._written[output]
+            report_template(template_path, documented)
+        return failed
+
+    def refresh(self) -> None:
+        # Without change events, files read before, and their folders, are compared with how they were when they were read.
+        # A folder changes when a file is created in it, so fragments which were missing are looked up again.
+        changed = {filename for filename, stat in self._stats.items() if _stat(filename) != stat}
+        for filename in changed:
+            del self._stats[filename]
+        self._forget(changed)
+
+    def _written_by_itself(self, filename: str) -> bool:
+        return filename in self._written and self._written[filename] == _stat(filename)
+
+    def _forget(self, changed: set) -> None:
+        for filename in changed:
+            self._fragments.invalidate(filename)
+        self._details = {files: details for files, details in self._details.items() if changed.isdisjoint(files)}
+
+    def _load(self, *filenames: str) -> tuple:
+        files = tuple(map(path.abspath, filenames))
+        if files not in self._details:
+            self._details[files] = load_details(*files)
+        return self._details[files]
+
+
+def create_watcher(folders: list, polling: bool = False):
+    if not polling:
+        try:
+            return InotifyWatcher(folders)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(folders)
+
+
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_ISDIR = 0x40000000
+_IN_CLOEXEC = 0o2000000
+_EVENT = struct.Struct('iIII')
+
+
+class InotifyWatcher:
+    _mask = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+
+    def __init__(self, folders: list):
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._fd = self._libc.inotify_init1(_IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+        self._folders = folders
+        self._watches = {}
+        try:
+            for folder in folders:
+                self._watch_tree(folder)
+        except OSError:
+            self.close()
+            raise
+
+    def _watch_tree(self, folder: str) -> list:
+        files = []
+        for directory, _, filenames in os.walk(folder):
+            descriptor = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self._mask)
+            if descriptor < 0:
+                raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()), directory)
+            self._watches[descriptor] = directory
+            files.extend(path.join(directory, filename) for filename in filenames)
+        return files
+
+    def changes(self, timeout: Union[float, None]) -> set:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+        buffer = os.read(self._fd, 65536)
+        changed = set()
+        offset = 0
+        while offset < len(buffer):
+            descriptor, mask, _, length = _EVENT.unpack_from(buffer, offset)
+            name = os.fsdecode(buffer[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b'\0'))
+            offset += _EVENT.size + length
+            if mask & _IN_Q_OVERFLOW:
+                # Events were lost, so every watched file is considered changed.
+                changed.update(_snapshot(self._folders))
+            elif descriptor in self._watches:
+                filename = path.join(self._watches[descriptor], name)
+                if mask & _IN_ISDIR:
+                    if mask & (_IN_CREATE | _IN_MOVED_TO):
+                        changed.update(self._watch_tree(filename))
+                else:
+                    changed.add(filename)
+        return changed
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class PollingWatcher:
+    def __init__(self, folders: list, interval: float = 0.5):
+        self._folders = folders
+        self._interval = interval
+        self._snapshot = _snapshot(folders)
+
+    def changes(self, timeout: Union[float, None]) -> set:
+        while True:
+            time.sleep(self._interval if timeout is None else min(timeout, self._interval))
+            snapshot = _snapshot(self._folders)
+            changed = {filename for filename in snapshot.keys() | self._snapshot.keys()
+                       if snapshot.get(filename) != self._snapshot.get(filename)}
+            self._snapshot = snapshot
+            if changed or timeout is not None:
+                return changed
+
+    def close(self) -> None:
+        pass
+
+
+def _snapshot(folders: list) -> dict:
+    snapshot = {}
+    for folder in folders:
+        for directory, _, filenames in os.walk(folder):
+            for filename in filenames:
+                filename = path.join(directory, filename)
+                snapshot[filename] = _stat(filename)
+    return snapshot
+
+
+def _tree_stats(folder: str) -> dict:
+    stats = {}
+    for directory, _, filenames in os.walk(folder):
+        stats[directory] = _stat(directory)
+        for filename in filenames:
+            filename = path.join(directory, filename)
+            stats[filename] = _stat(filename)
+    return stats
+
+
+def _stat(filename: str) -> Union[tuple, None]:
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
@@ -0,0 +1,82 @@
+import hashlib
+import os
+import shutil
+import uuid
+from typing import Iterable, Union
+
+
+class Writer:
+    # Outputs are written to a temporary file and renamed over the output, so an interrupted run
+    # never leaves a truncated file. Directories of outputs are created once per writer.
+    def __init__(self):
+        self._directories = set()
+
+    def write(self, output: str, chunks: Iterable[bytes]) -> None:
+        self.commit(self.stage(output, chunks), output)
+
+    def stage(self, output: str, chunks: Iterable[bytes]) -> str:
+        self._create_directory(os.path.dirname(os.path.abspath(output)))
+        temporary = f"{output}.{uuid.uuid4().hex[:8]}.tmp"
+        try:
+            with open(temporary, "xb") as file:
+                for chunk in chunks:
+                    file.write(chunk)
+            if os.path.exists(output):
+                shutil.copymode(output, temporary)
+        except BaseException:
+            _remove(temporary)
+            raise
+        return temporary
+
+    def commit(self, temporary: str, output: str) -> None:
+        try:
+            os.replace(temporary, output)
+        except BaseException:
+            _remove(temporary)
+            raise
+
+    def _create_directory(self, directory: str) -> None:
+        if directory not in self._directories:
+            os.makedirs(directory, exist_ok=True)
+            self._directories.add(directory)
+
+
+def _remove(temporary: str) -> None:
+    if os.path.exists(temporary):
+        os.remove(temporary)
+
+
+def sync(filenames: Iterable[str]) -> None:
+    directories = set()
+    for filename in filenames:
+        _fsync(filename, os.O_RDONLY)
+        directories.add(os.path.dirname(os.path.abspath(filename)))
+    for directory in directories:
+        # Renames are persisted by syncing the directory, which isn't supported on every platform
+        _fsync(directory, getattr(os, 'O_DIRECTORY', os.O_RDONLY))
+
+
+def _fsync(filename: str, flags: int) -> None:
+    try:
+        descriptor = os.open(filename, flags)
+    except (FileNotFoundError, PermissionError, IsADirectoryError):
+        return
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def digest(chunks: Iterable[bytes]) -> str:
+    hashed = hashlib.sha1()
+    for chunk in chunks:
+        hashed.update(chunk)
+    return hashed.hexdigest()
+
+
+def file_digest(filename: str, chunk_size: int = 1 << 20) -> Union[str, None]:
+    try:
+        with open(filename, "rb") as file:
+            return digest(iter(lambda: file.read(chunk_size), b''))
+    except FileNotFoundError:
+        return None
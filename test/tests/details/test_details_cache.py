@@ -0,0 +1,83 @@
+from json import dumps
+from unittest import TestCase
+from unittest.mock import patch
+
+from documentary.details.details_cache import DetailsCache
+from documentary.details.preprocess_details import load_details
+from test.tmpdir import directory
+
+
+class DetailsCacheTest(TestCase):
+    def test_should_miss_before_put(self):
+        with directory() as tmp:
+            # when
+            cached = DetailsCache(tmp.join('cache')).get([b'{}', None, None])
+
+            # then
+            self.assertIsNone(cached)
+
+    def test_should_get_put_details(self):
+        with directory() as tmp:
+            # given
+            DetailsCache(tmp.join('cache')).put([b'{}', None, None], ({'method': {}}, {}))
+
+            # when
+            cached = DetailsCache(tmp.join('cache')).get([b'{}', None, None])
+
+            # then
+            self.assertEqual(({'method': {}}, {}), cached)
+
+    def test_should_distinguish_missing_and_empty_files(self):
+        with directory() as tmp:
+            # given
+            cache = DetailsCache(tmp.join('cache'))
+            cache.put([b'', None, None], ({}, {}))
+
+            # when
+            cached = cache.get([None, b'', None])
+
+            # then
+            self.assertIsNone(cached)
+
+    def test_should_miss_corrupted_entry(self):
+        with directory() as tmp:
+            # given
+            cache = DetailsCache(tmp.join('cache'))
+            cache.put([None, None, None], ({}, {}))
+            with open(cache._entry([None, None, None]), 'wb') as file:
+                file.write(b'corrupted')
+
+            # when
+            cached = cache.get([None, None, None])
+
+            # then
+            self.assertIsNone(cached)
+
+    def test_should_load_details_from_cache(self):
+        with directory() as tmp:
+            # given
+            tmp.store('definition.json', dumps({'method': {'definition': 'Foo'}}))
+            cache = DetailsCache(tmp.join('cache'))
+            expected = load_details(tmp.join('definition.json'), tmp.join('missing.json'), tmp.join('missing.json'), details_cache=cache)
+
+            # when
+            with patch('documentary.details.preprocess_details.build_details') as build:
+                details = load_details(tmp.join('definition.json'), tmp.join('missing.json'), tmp.join('missing.json'), details_cache=cache)
+
+            # then
+            build.assert_not_called()
+            self.assertEqual(expected, details)
+
+    def test_should_build_details_of_changed_file(self):
+        with directory() as tmp:
+            # given
+            tmp.store('definition.json', dumps({'method': {'definition': 'Foo'}}))
+            cache = DetailsCache(tmp.join('cache'))
+            load_details(tmp.join('definition.json'), tmp.join('missing.json'), tmp.join('missing.json'), details_cache=cache)
+            tmp.store('definition.json', dumps({'method': {'definition': 'Bar'}}))
+
+            # when
+            details, _ = load_details(tmp.join('definition.json'), tmp.join('missing.json'), tmp.join('missing.json'), details_cache=cache)
+
+            # then
+            self.assertEqual('Bar', details['method']['definition'])
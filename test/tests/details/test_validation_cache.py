@@ -0,0 +1,96 @@
+from json import dumps
+from unittest import TestCase
+from unittest.mock import patch
+
+from schema import SchemaError
+
+from documentary.details.preprocess_details import load_details
+from documentary.details.validation_cache import ValidationCache
+from test.tmpdir import directory
+
+
+class ValidationCacheTest(TestCase):
+    def test_should_not_be_validated_before_record(self):
+        with directory() as tmp:
+            # given
+            cache = ValidationCache(tmp.join('cache'))
+
+            # when
+            validated = cache.validated('definitions', b'{}')
+
+            # then
+            self.assertFalse(validated)
+
+    def test_should_be_validated_after_record(self):
+        with directory() as tmp:
+            # given
+            cache = ValidationCache(tmp.join('cache'))
+            cache.record('definitions', b'{}')
+
+            # when
+            validated = ValidationCache(tmp.join('cache')).validated('definitions', b'{}')
+
+            # then
+            self.assertTrue(validated)
+
+    def test_should_distinguish_kinds_and_contents(self):
+        with directory() as tmp:
+            # given
+            cache = ValidationCache(tmp.join('cache'))
+            cache.record('definitions', b'{}')
+
+            # when, then
+            self.assertFalse(cache.validated('declarations', b'{}'))
+            self.assertFalse(cache.validated('definitions', b'{ }'))
+
+    def test_should_record_twice(self):
+        with directory() as tmp:
+            # given
+            cache = ValidationCache(tmp.join('cache'))
+
+            # when
+            cache.record('definitions', b'{}')
+            cache.record('definitions', b'{}')
+
+            # then
+            self.assertTrue(cache.validated('definitions', b'{}'))
+
+    def test_should_not_trust_records_of_other_users(self):
+        with directory() as tmp:
+            # given
+            ValidationCache(tmp.join('cache')).record('definitions', b'{}')
+
+            # when
+            with patch('os.getuid', return_value=-1):
+                untrusted = ValidationCache(tmp.join('cache')).validated('definitions', b'{}')
+                trusted = ValidationCache(tmp.join('cache'), trust_others=True).validated('definitions', b'{}')
+
+            # then
+            self.assertFalse(untrusted)
+            self.assertTrue(trusted)
+
+    def test_should_skip_validation_of_validated_details(self):
+        with directory() as tmp:
+            # given
+            tmp.store('definition.json', dumps({'method': {'definition': 'Foo'}}))
+            cache = ValidationCache(tmp.join('cache'))
+            load_details(tmp.join('definition.json'), tmp.join('missing.json'), tmp.join('missing.json'), cache)
+
+            # when
+            with patch('documentary.validate.definitions') as validate:
+                details, _ = load_details(tmp.join('definition.json'), tmp.join('missing.json'), tmp.join('missing.json'), cache)
+
+            # then
+            validate.assert_not_called()
+            self.assertEqual('Foo', details['method']['definition'])
+
+    def test_should_not_record_invalid_details(self):
+        with directory() as tmp:
+            # given
+            tmp.store('definition.json', dumps({'method': {'unknown': 'Foo'}}))
+            cache = ValidationCache(tmp.join('cache'))
+
+            # when
+            for _ in range(2):
+                with self.assertRaises(SchemaError):
+                    load_details(tmp.join('definition.json'), tmp.join('missing.json'), tmp.join('missing.json'), cache)
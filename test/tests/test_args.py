@@ -0,0 +1,25 @@
+import io
+from contextlib import redirect_stderr
+
+from documentary.args import parse_args
+from test.TestCase import TestCase
+
+
+class ArgsTest(TestCase):
+    def test_should_parse_workers(self):
+        # when
+        args = parse_args(['--template', 'src', '--jobs', '2', '--readers', '3'])
+
+        # then
+        self.assertEqual((2, 3), (args.jobs, args.readers))
+
+    def test_should_reject_no_workers(self):
+        for argv in [['--jobs', '0'], ['--readers', '0'], ['--readers', '-1'], ['--jobs', 'many']]:
+            with self.subTest(argv):
+                with redirect_stderr(io.StringIO()):
+                    # when
+                    with self.assertRaises(SystemExit) as context:
+                        parse_args(['--template', 'src', *argv])
+
+                # then
+                self.assertEqual(2, context.exception.code)
@@ -0,0 +1,68 @@
+from schema import SchemaError
+
+from documentary.batch import document_sources
+from documentary.document import document_many
+from documentary.stats import Stats, recording
+from test.TestCase import TestCase
+from test.std_io import stubbed_output
+from test.tmpdir import directory
+
+_DOCUMENTARY = {
+    'src/First.php/declaration.json': '{"foo": {"param": {"bar": "int"}}}',
+    'src/Second.php/declaration.json': '{"foo": {"param": {"bar": "int"}}}',
+    'src/Second.php/fragments/foo.param.bar.html': 'Own bar',
+    'project/fragment/param.bar.html': 'Bar',
+}
+
+
+class DocumentSourcesTest(TestCase):
+    def test_should_document_sources(self):
+        # when
+        documented = list(document_sources([
+            ('src/First.php', '/** {documentary:foo} */'),
+            ('src/Second.php', '/** {documentary:foo} */'),
+        ], _DOCUMENTARY))
+
+        # then
+        self.assertEqual([
+            ('src/First.php', '/**\n * {documentary:foo}\n *\n * @param int $bar Bar\n */'),
+            ('src/Second.php', '/**\n * {documentary:foo}\n *\n * @param int $bar Own bar\n */'),
+        ], documented)
+
+    def test_should_pass_sources_without_placeholders(self):
+        # when
+        documented = list(document_sources([('src/Third.php', '<?php\nclass Third {}\n')], {}))
+
+        # then
+        self.assertEqual([('src/Third.php', '<?php\nclass Third {}\n')], documented)
+
+    def test_should_document_like_files(self):
+        with directory() as tmp:
+            # given
+            tmp.store('src/First.php', '/** {documentary:foo} */')
+            for filename, content in _DOCUMENTARY.items():
+                tmp.store(['documentary', filename], content)
+            with stubbed_output():
+                document_many(tmp.join('documentary'), tmp.join(), 'src/First.php', tmp.join('output'))
+
+            # when
+            documented = list(document_sources([('src/First.php', '/** {documentary:foo} */')], _DOCUMENTARY))
+
+            # then
+            self.assertEqual([('src/First.php', tmp.open('output', 'src', 'First.php'))], documented)
+
+    def test_should_share_rendered_docblocks_in_batch(self):
+        with recording(Stats()) as stats:
+            # when
+            list(document_sources([('src/First.php', '/** {documentary:foo} */')] * 3, _DOCUMENTARY))
+
+        # then
+        self.assertEqual({'docblock misses': 1, 'docblock hits': 2}, stats.counts)
+
+    def test_should_raise_for_invalid_details(self):
+        # given
+        documentary = {'src/First.php/declaration.json': '{"foo": {"param": {"bar": 4}}}'}
+
+        # when
+        with self.assertRaises(SchemaError):
+            list(document_sources([('src/First.php', '/** {documentary:foo} */')], documentary))
@@ -0,0 +1,49 @@
+from benchmarks.corpus import generate
+from benchmarks.run import scenarios, compare
+from documentary.document import document_many
+from test.TestCase import TestCase
+from test.std_io import stubbed_output
+from test.tmpdir import directory
+
+
+class BenchmarksTest(TestCase):
+    def test_should_generate_documentable_corpus(self):
+        with stubbed_output() as lines:
+            with directory() as tmp:
+                # given
+                generate(tmp.join(), classes=2, methods=3)
+
+                # when
+                document_many(tmp.join('documentary'), tmp.join(), 'src', tmp.join('output'))
+
+                # then
+                self.assertPathsMatch(actual=lines(), expected=[
+                    f'File "{tmp.join("src", "Class0.php")}" documented',
+                    f'File "{tmp.join("src", "Class1.php")}" documented',
+                ])
+                self.assertIn(' * @param string $subject Subject, which is matched against the <b>pattern</b>.',
+                              tmp.open('output', 'src', 'Class1.php'))
+
+    def test_should_run_scenarios(self):
+        with directory() as tmp:
+            # given
+            generate(tmp.join(), classes=1, methods=1)
+
+            # when
+            with stubbed_output():
+                results = {name: function() for name, function in scenarios(tmp.join(), jobs=1).items()}
+
+            # then
+            self.assertEqual(['src/Class0.php'], results['discover_templates'])
+            self.assertIn('* Performs operation number 0 on <i>subject</i>.', results['populate'])
+
+    def test_should_compare_results(self):
+        # given
+        baseline = {'commit': 'abc', 'results': {'populate': {'best': 2.0}, 'removed': {'best': 1.0}}}
+        results = {'results': {'populate': {'best': 1.0}, 'added': {'best': 1.0}}}
+
+        # when
+        lines = compare(results, baseline)
+
+        # then
+        self.assertEqual(['            populate:   0.50x of abc'], lines)
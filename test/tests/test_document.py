@@ -1,10 +1,22 @@
-from documentary.document import document, document_many
+import os
+import threading
+import unittest
+from unittest.mock import patch
+
+from documentary import document as documenting
+from documentary.details.validation_cache import ValidationCache
+from documentary.document import document, document_many, template_paths, DocumentationException
 from test.TestCase import TestCase
 from test.resource import resource
 from test.std_io import stubbed_output
 from test.tmpdir import directory
 
 
+_threads_at_fork = []
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(before=lambda: _threads_at_fork.append(threading.active_count()))
+
+
 class EndToEndTest(TestCase):
     def setUp(self) -> None:
         self.maxDiff = 65513
@@ -45,3 +57,196 @@ class EndToEndTest(TestCase):
                     f'File "{resource("input")}/src/SafeRegex/preg.php" documented',
                     f'File "{resource("input")}/src/CleanRegex/Pattern.php" documented',
                 ])
+
+    def test_many_parallel(self):
+        with stubbed_output() as lines:
+            with directory() as tmp:
+                # when
+                document_many(
+                    documentary_path=resource('input/documentary'),
+                    root_path=resource('input'),
+                    templates_path='src',
+                    output_path=tmp.join('output'),
+                    jobs=2)
+
+                # then
+                with open(resource('expected/preg.php'), 'r') as expected:
+                    self.assertEqual(expected.read(), tmp.open('output/src/SafeRegex/preg.php'))
+
+                with open(resource('expected/Pattern.php'), 'r') as expected:
+                    self.assertEqual(expected.read(), tmp.open('output/src/CleanRegex/Pattern.php'))
+
+                self.assertPathsMatch(actual=lines(), expected=[
+                    f'File "{resource("input")}/src/SafeRegex/preg.php" documented',
+                    f'File "{resource("input")}/src/CleanRegex/Pattern.php" documented',
+                ])
+
+    def test_many_should_record_validated_details(self):
+        with stubbed_output():
+            with directory() as tmp:
+                # when
+                document_many(
+                    documentary_path=resource('input/documentary'),
+                    root_path=resource('input'),
+                    templates_path='src',
+                    output_path=tmp.join('output'),
+                    jobs=2,
+                    validation_cache=ValidationCache(tmp.join('validated')))
+
+                # then
+                with open(resource('expected/Pattern.php'), 'r') as expected:
+                    self.assertEqual(expected.read(), tmp.open('output/src/CleanRegex/Pattern.php'))
+                self.assertTrue(os.listdir(tmp.join('validated')))
+
+    @unittest.skipUnless(hasattr(os, 'register_at_fork'), "requires os.register_at_fork()")
+    def test_many_parallel_should_fork_without_threads(self):
+        with stubbed_output():
+            with directory() as tmp:
+                # given
+                del _threads_at_fork[:]
+
+                # when
+                document_many(resource('input/documentary'), resource('input'), 'src', tmp.join('output'), jobs=2, readers=2)
+
+                # then
+                self.assertTrue(_threads_at_fork)
+                self.assertEqual([1] * len(_threads_at_fork), _threads_at_fork)
+
+    def test_many_should_report_errors_per_file(self):
+        with stubbed_output() as lines:
+            with directory() as tmp:
+                # given
+                tmp.store('src/Invalid.php', '/** {documentary:foo} */')
+                tmp.store('src/Valid.php', '/** {documentary:foo} */')
+                tmp.store('documentary/src/Invalid.php/definition.json', '{"foo": {"definition": 4}}')
+                tmp.store('documentary/src/Valid.php/definition.json', '{"foo": {"definition": "Valid"}}')
+
+                # when
+                with self.assertRaises(DocumentationException) as error:
+                    document_many(tmp.join('documentary'), tmp.join(), 'src', tmp.join())
+
+                # then
+                self.assertEqual("Failed to document 1 file(s)", str(error.exception))
+                self.assertEqual(['/** {documentary:foo} */', '/**\n * {documentary:foo}\n *\n * Valid.\n */'],
+                                 [tmp.open('src/Invalid.php'), tmp.open('src/Valid.php')])
+                self.assertIn(f'File "{tmp.join("src", "Valid.php")}" documented', lines())
+                self.assertTrue(any(line.startswith(f'File "{tmp.join("src", "Invalid.php")}" failed: ') for line in lines()))
+
+    def test_many_should_report_unreadable_details(self):
+        with stubbed_output() as lines:
+            with directory() as tmp:
+                # given
+                tmp.store('src/First.php', '/** {documentary:foo} */')
+                tmp.store('src/Second.php', '/** {documentary:foo} */')
+                tmp.dir('documentary/src/First.php/definition.json')
+                tmp.store('documentary/src/Second.php/definition.json', '{"foo": {"definition": "Valid"}}')
+
+                # when
+                with self.assertRaises(DocumentationException):
+                    document_many(tmp.join('documentary'), tmp.join(), 'src', tmp.join(), jobs=2, readers=2)
+
+                # then
+                self.assertEqual('/**\n * {documentary:foo}\n *\n * Valid.\n */', tmp.open('src/Second.php'))
+                self.assertTrue(any(line.startswith(f'File "{tmp.join("src", "First.php")}" failed: ') for line in lines()))
+
+    def test_many_should_not_write_template_changed_while_documented(self):
+        with stubbed_output() as lines:
+            with directory() as tmp:
+                # given
+                tmp.store('src/Template.php', '/** {documentary:foo} */')
+                tmp.store('documentary/src/Template.php/definition.json', '{"foo": {"definition": "Valid"}}')
+                replacements = documenting.replacements
+
+                def changing_replacements(*args):
+                    with open(tmp.join('src/Template.php'), 'a') as file:
+                        file.write('changed')
+                    return replacements(*args)
+
+                # when
+                with patch('documentary.document.replacements', changing_replacements):
+                    with self.assertRaises(DocumentationException):
+                        document_many(tmp.join('documentary'), tmp.join(), 'src', tmp.join())
+
+                # then
+                self.assertEqual('/** {documentary:foo} */changed', tmp.open('src/Template.php'))
+                self.assertEqual([f'File "{tmp.join("src", "Template.php")}" failed: '
+                                  f'File "{tmp.join("src", "Template.php")}" changed while it was documented'], lines())
+
+    def test_many_should_document_templates_in_order_of_discovery(self):
+        with stubbed_output() as lines:
+            with directory() as tmp:
+                # given
+                templates = [f'src/Template{index:02}.php' for index in range(20)]
+                for template in templates:
+                    tmp.store(template, '/** {documentary:foo} */')
+                    tmp.store(f'documentary/{template}/definition.json', '{"foo": {"definition": "Valid"}}')
+
+                # when
+                document_many(tmp.join('documentary'), tmp.join(), 'src', tmp.join('output'), jobs=3, readers=3)
+
+                # then
+                discovered = template_paths(tmp.join('documentary'), tmp.join(), 'src', tmp.join('output'))
+                self.assertEqual([f'File "{template_path}" documented' for _, template_path, _ in discovered], lines())
+                self.assertEqual(['/**\n * {documentary:foo}\n *\n * Valid.\n */'] * 20,
+                                 [tmp.open('output', template) for template in templates])
+
+    def test_many_should_skip_unchanged_templates(self):
+        with directory() as tmp:
+            # given
+            tmp.store('src/Valid.php', '/** {documentary:foo} */')
+            tmp.store('documentary/src/Valid.php/definition.json', '{"foo": {"definition": "Valid"}}')
+            document_many(tmp.join('documentary'), tmp.join(), 'src', tmp.join('output'), cache=tmp.join('.documentary-cache'))
+
+            with stubbed_output() as lines:
+                # when
+                document_many(tmp.join('documentary'), tmp.join(), 'src', tmp.join('output'), cache=tmp.join('.documentary-cache'))
+
+                # then
+                self.assertEqual([f'File "{tmp.join("src", "Valid.php")}" remains unchanged'], lines())
+
+    def test_many_should_document_template_with_changed_fragment(self):
+        with directory() as tmp:
+            # given
+            tmp.store('src/Valid.php', '/** {documentary:foo} */')
+            tmp.store('documentary/src/Valid.php/declaration.json', '{"foo": {"param": {"bar": "int"}}}')
+            document_many(tmp.join('documentary'), tmp.join(), 'src', tmp.join('output'), cache=tmp.join('.documentary-cache'))
+            tmp.store('documentary/project/fragment/param.bar.html', 'Created')
+
+            with stubbed_output():
+                # when
+                document_many(tmp.join('documentary'), tmp.join(), 'src', tmp.join('output'), cache=tmp.join('.documentary-cache'))
+
+            # then
+            self.assertEqual('/**\n * {documentary:foo}\n *\n * @param int $bar Created\n */', tmp.open('output/src/Valid.php'))
+
+    def test_many_should_document_only_templates_affected_by_changed_files(self):
+        with directory() as tmp:
+            # given
+            tmp.store('src/First.php', '/** {documentary:foo} */')
+            tmp.store('src/Second.php', '/** {documentary:foo} */')
+            tmp.store('documentary/src/First.php/declaration.json', '{"foo": {"param": {"bar": "int"}}}')
+            tmp.store('documentary/src/Second.php/declaration.json', '{"foo": {"param": {"baz": "int"}}}')
+            with stubbed_output():
+                document_many(tmp.join('documentary'), tmp.join(), 'src', tmp.join('output'), cache=tmp.join('.documentary-cache'))
+            tmp.store('documentary/project/fragment/param.bar.html', 'Created')
+
+            with stubbed_output() as lines:
+                # when
+                document_many(tmp.join('documentary'), tmp.join(), 'src', tmp.join('output'), cache=tmp.join('.documentary-cache'),
+                              changed=[tmp.join('documentary/project/fragment/param.bar.html')])
+
+                # then
+                self.assertEqual([f'File "{tmp.join("src", "First.php")}" documented'], lines())
+
+    def test_should_not_load_details_for_template_without_placeholders(self):
+        with stubbed_output() as lines:
+            with directory() as tmp:
+                # given
+                tmp.store('src/Template.php', '<?php\n/** Regular */')
+                tmp.store('documentary/src/Template.php/definition.json', 'malformed')
+
+                # when
+                document(tmp.join('documentary'), tmp.join('documentary/src/Template.php'), tmp.join('src/Template.php'), tmp.join('src/Template.php'))
+
+                # then
+                self.assertEqual([f'File "{tmp.join("src/Template.php")}" remains unchanged'], lines())
@@ -1,6 +1,9 @@
+import os
+import stat
 from unittest import TestCase
+from unittest.mock import patch
 
-from documentary.files import fragment_fallback, MissingFragmentException, fragment
+from documentary.files import fragment_fallback, MissingFragmentException, fragment, contains, rewrite_file
 from test.tmpdir import directory
 
 
@@ -51,3 +54,175 @@ class FormatTest(TestCase):
 
             # then
             self.assertEqual('returned', result)
+
+    def test_should_find_marker(self):
+        with directory() as tmp:
+            # given
+            tmp.store('template.php', '<?php\n/** {documentary:foo} */')
+
+            # when
+            result = contains(tmp.join('template.php'), b'documentary')
+
+            # then
+            self.assertTrue(result)
+
+    def test_should_not_find_marker(self):
+        with directory() as tmp:
+            # given
+            tmp.store('template.php', '<?php\n/** Regular */')
+
+            # when
+            result = contains(tmp.join('template.php'), b'documentary')
+
+            # then
+            self.assertFalse(result)
+
+    def test_should_not_find_marker_in_empty_file(self):
+        with directory() as tmp:
+            # given
+            tmp.store('template.php', '')
+
+            # when
+            result = contains(tmp.join('template.php'), b'documentary')
+
+            # then
+            self.assertFalse(result)
+
+    def test_should_rewrite_replaced_segments(self):
+        with directory() as tmp:
+            # given
+            tmp.store('template.php', 'first [foo] second [bar] third')
+
+            # when
+            result = rewrite_file(tmp.join('template.php'), tmp.join('output', 'template.php'), self.replacements({'[foo]': 'Foo', '[bar]': 'Bar'}))
+
+            # then
+            self.assertTrue(result)
+            self.assertEqual('first Foo second Bar third', tmp.open('output', 'template.php'))
+            self.assertEqual(['template.php'], os.listdir(tmp.join('output')))
+
+    def test_should_not_write_unchanged_segments(self):
+        with directory() as tmp:
+            # given
+            tmp.store('template.php', 'first [foo] second')
+            os.utime(tmp.join('template.php'), ns=(0, 0))
+
+            # when
+            result = rewrite_file(tmp.join('template.php'), tmp.join('template.php'), self.replacements({'[foo]': '[foo]'}))
+
+            # then
+            self.assertFalse(result)
+            self.assertEqual(0, os.stat(tmp.join('template.php')).st_mtime_ns)
+
+    def test_should_write_missing_output(self):
+        with directory() as tmp:
+            # given
+            tmp.store('template.php', 'first [foo] second')
+
+            # when
+            result = rewrite_file(tmp.join('template.php'), tmp.join('output', 'template.php'), self.replacements({'[foo]': '[foo]'}))
+
+            # then
+            self.assertTrue(result)
+            self.assertEqual('first [foo] second', tmp.open('output', 'template.php'))
+
+    def test_should_not_write_output_of_equal_content(self):
+        with directory() as tmp:
+            # given
+            tmp.store('template.php', 'first [foo] second')
+            tmp.store('output/template.php', 'first Foo second')
+            os.utime(tmp.join('output', 'template.php'), ns=(0, 0))
+
+            # when
+            result = rewrite_file(tmp.join('template.php'), tmp.join('output', 'template.php'), self.replacements({'[foo]': 'Foo'}))
+
+            # then
+            self.assertFalse(result)
+            self.assertEqual(0, os.stat(tmp.join('output', 'template.php')).st_mtime_ns)
+
+    def test_should_preserve_unchanged_bytes(self):
+        with directory() as tmp:
+            # given
+            with open(tmp.join('template.php'), 'wb') as file:
+                file.write(b'first\r\n[foo]\r\nsecond')
+
+            # when
+            rewrite_file(tmp.join('template.php'), tmp.join('template.php'), self.replacements({'[foo]': 'Foo'}))
+
+            # then
+            with open(tmp.join('template.php'), 'rb') as file:
+                self.assertEqual(b'first\r\nFoo\r\nsecond', file.read())
+
+    def test_should_preserve_mode_of_output(self):
+        with directory() as tmp:
+            # given
+            tmp.store('template.php', '[foo]')
+            os.chmod(tmp.join('template.php'), 0o751)
+
+            # when
+            rewrite_file(tmp.join('template.php'), tmp.join('template.php'), self.replacements({'[foo]': 'Foo'}))
+
+            # then
+            self.assertEqual(0o751, stat.S_IMODE(os.stat(tmp.join('template.php')).st_mode))
+
+    def test_should_not_leave_temporary_file_on_error(self):
+        with directory() as tmp:
+            # given
+            tmp.store('template.php', '[foo] [bar]')
+
+            def replacements(content):
+                yield 0, 5, 'Foo'
+                raise ValueError()
+
+            # when
+            with self.assertRaises(ValueError):
+                rewrite_file(tmp.join('template.php'), tmp.join('template.php'), replacements)
+
+            # then
+            self.assertEqual(['template.php'], os.listdir(tmp.join()))
+            self.assertEqual('[foo] [bar]', tmp.open('template.php'))
+
+    def test_should_rewrite_empty_file(self):
+        with directory() as tmp:
+            # given
+            tmp.store('template.php', '')
+
+            # when
+            result = rewrite_file(tmp.join('template.php'), tmp.join('template.php'), lambda content: iter([(0, 0, 'Foo')]))
+
+            # then
+            self.assertTrue(result)
+            self.assertEqual('Foo', tmp.open('template.php'))
+
+    def test_should_close_template_before_replacing_it(self):
+        with directory() as tmp:
+            # given
+            tmp.store('template.php', '[foo]')
+            opened = []
+            closed = []
+            replace = os.replace
+
+            def tracked_open(*args, **kwargs):
+                file = open(*args, **kwargs)
+                opened.append(file)
+                return file
+
+            def tracked_replace(source, destination):
+                closed.append(all(file.closed for file in opened))
+                replace(source, destination)
+
+            # when
+            with patch('documentary.files.open', tracked_open, create=True), patch('documentary.writer.os.replace', tracked_replace):
+                rewrite_file(tmp.join('template.php'), tmp.join('template.php'), self.replacements({'[foo]': 'Foo'}))
+
+            # then
+            self.assertEqual([True], closed)
+            self.assertEqual('Foo', tmp.open('template.php'))
+
+    def replacements(self, replaced: dict) -> callable:
+        def replacements(content):
+            for search, replacement in replaced.items():
+                start = content.find(search.encode())
+                yield start, start + len(search), replacement
+
+        return replacements
@@ -1,4 +1,7 @@
-from documentary.folder import discover_templates, TemplatesDiscoveryException
+import os
+from unittest.mock import patch
+
+from documentary.folder import discover_templates, iterate_templates, TemplatesDiscoveryException
 from test.TestCase import TestCase
 from test.tmpdir import directory
 
@@ -75,3 +78,49 @@ class FolderTest(TestCase):
 
             # then
             self.assertEqual("File/folder 'src/main' is not documented", str(error.exception))
+
+    def test_should_discover_children_in_order(self):
+        with directory() as tmp:
+            # given
+            for template in ['src/first.py', 'src/main/first.py', 'src/main/sub/first.py', 'src/test/first.py']:
+                tmp.store(template, 'template file')
+                tmp.dir(['docs', template])
+
+            # when
+            result = discover_templates('src/', tmp.join(), documentary=tmp.join('docs'))
+
+            # then
+            self.assertEqual(sorted(result, key=lambda template: template.count('/')), result)
+            self.assertPathsMatch(actual=result, expected=['src/first.py', 'src/main/first.py', 'src/main/sub/first.py', 'src/test/first.py'])
+
+    def test_should_not_enter_documented_folders_missing_in_root(self):
+        with directory() as tmp:
+            # given
+            tmp.store('src/first.py', 'template file')
+            tmp.dir('docs/src/first.py/fragments')
+            tmp.dir('docs/src/removed/deep')
+
+            # when
+            with patch('os.scandir', wraps=os.scandir) as scandir:
+                result = discover_templates('src', tmp.join(), documentary=tmp.join('docs'))
+
+            # then
+            self.assertPathsMatch(actual=result, expected=['src/first.py'])
+            self.assertEqual([tmp.join('docs', 'src'), tmp.join('src')], [call.args[0] for call in scandir.call_args_list])
+
+    def test_should_iterate_templates_lazily(self):
+        with directory() as tmp:
+            # given
+            tmp.store('src/first.py', 'template file')
+            tmp.store('src/main/second.py', 'template file')
+            tmp.dir('docs/src/first.py')
+            tmp.dir('docs/src/main/second.py')
+            templates = iterate_templates('src', tmp.join(), documentary=tmp.join('docs'))
+
+            # when
+            first = next(templates)
+            tmp.dir('docs/src/main/third.py')
+            tmp.store('src/main/third.py', 'template file')
+
+            # then
+            self.assertPathsMatch(actual=[first, *templates], expected=['src/first.py', 'src/main/second.py', 'src/main/third.py'])
@@ -0,0 +1,194 @@
+import subprocess
+
+from documentary.__main__ import run
+from documentary.args import parse_args
+from documentary.document import DocumentationException
+from documentary.git import verify_revision, read_blobs, tree
+from test.TestCase import TestCase
+from test.std_io import stubbed_output
+from test.tmpdir import directory
+
+
+class VerifyRevisionTest(TestCase):
+    def test_should_verify_documented_templates(self):
+        with directory() as tmp:
+            # given
+            self.given_templates(tmp, '/**\n * {documentary:foo}\n *\n * @param int $bar Bar\n */')
+            commit(tmp)
+
+            with stubbed_output() as lines:
+                # when
+                verify_revision(tmp.join(), 'src', 'HEAD')
+
+                # then
+                self.assertEqual([f'File "{tmp.join("src", "First.php")}" is up to date'], lines())
+
+    def test_should_report_outdated_templates(self):
+        with directory() as tmp:
+            # given
+            self.given_templates(tmp, '/** {documentary:foo} */')
+            commit(tmp)
+
+            with stubbed_output() as lines:
+                # when
+                with self.assertRaises(DocumentationException) as context:
+                    verify_revision(tmp.join(), 'src', 'HEAD')
+
+                # then
+                self.assertEqual([f'File "{tmp.join("src", "First.php")}" differs from its documentation'], lines())
+                self.assertEqual('1 file(s) differ from their documentation in HEAD', str(context.exception))
+
+    def test_should_read_revision_instead_of_working_tree(self):
+        with directory() as tmp:
+            # given
+            self.given_templates(tmp, '/**\n * {documentary:foo}\n *\n * @param int $bar Bar\n */')
+            commit(tmp)
+            tmp.store('documentary/project/fragment/param.bar.html', 'Changed')
+            tmp.store('src/First.php', '/** {documentary:foo} */')
+
+            with stubbed_output() as lines:
+                # when
+                verify_revision(tmp.join(), 'src/First.php', 'HEAD')
+
+                # then
+                self.assertEqual([f'File "{tmp.join("src", "First.php")}" is up to date'], lines())
+                self.assertEqual('/** {documentary:foo} */', tmp.open('src/First.php'))
+
+    def test_should_skip_templates_without_documentation(self):
+        with directory() as tmp:
+            # given
+            self.given_templates(tmp, '/**\n * {documentary:foo}\n *\n * @param int $bar Bar\n */')
+            tmp.store('src/Undocumented.php', '/** {documentary:foo} */')
+            commit(tmp)
+
+            with stubbed_output() as lines:
+                # when
+                verify_revision(tmp.join(), '.', 'HEAD')
+
+                # then
+                self.assertEqual([f'File "{tmp.join("src", "First.php")}" is up to date'], lines())
+
+    def test_should_ignore_binary_files(self):
+        with directory() as tmp:
+            # given
+            self.given_templates(tmp, '/**\n * {documentary:foo}\n *\n * @param int $bar Bar\n */')
+            with open(tmp.join('documentary', '.DS_Store'), 'wb') as file:
+                file.write(b'\x00\x00\x00\x01Bud1\xff\xfe')
+            commit(tmp)
+
+            with stubbed_output() as lines:
+                # when
+                verify_revision(tmp.join(), 'src', 'HEAD')
+
+                # then
+                self.assertEqual([f'File "{tmp.join("src", "First.php")}" is up to date'], lines())
+
+    def test_should_fail_only_templates_using_undecodable_fragment(self):
+        with directory() as tmp:
+            # given
+            self.given_templates(tmp, '/**\n * {documentary:foo}\n *\n * @param int $bar Bar\n */')
+            tmp.store('src/Second.php', '/** {documentary:foo} */')
+            tmp.store('documentary/src/Second.php/declaration.json', '{"foo": {"param": {"baz": "int"}}}')
+            with open(tmp.join('documentary', 'project', 'fragment', 'param.baz.html'), 'wb') as file:
+                file.write(b'\xff\xfe\xfa')
+            commit(tmp)
+
+            with stubbed_output() as lines:
+                # when
+                with self.assertRaises(DocumentationException):
+                    verify_revision(tmp.join(), 'src', 'HEAD')
+
+                # then
+                self.assertEqual(f'File "{tmp.join("src", "First.php")}" is up to date', lines()[0])
+                self.assertTrue(lines()[1].startswith(f'File "{tmp.join("src", "Second.php")}" failed: '))
+
+    def test_should_report_failed_templates(self):
+        with directory() as tmp:
+            # given
+            self.given_templates(tmp, '/** {documentary:foo} */')
+            tmp.store('documentary/src/First.php/declaration.json', '{"foo": {"param": {"bar": 4}}}')
+            commit(tmp)
+
+            with stubbed_output() as lines:
+                # when
+                with self.assertRaises(DocumentationException):
+                    verify_revision(tmp.join(), 'src', 'HEAD')
+
+                # then
+                self.assertEqual([f'File "{tmp.join("src", "First.php")}" failed: Invalid declaration of \'foo\': {{"param": {{"bar": 4}}}}'],
+                                 lines())
+
+    def test_should_raise_for_missing_template(self):
+        with directory() as tmp:
+            # given
+            self.given_templates(tmp, '')
+            commit(tmp)
+
+            # when
+            with self.assertRaises(FileNotFoundError) as context:
+                verify_revision(tmp.join(), 'lib', 'HEAD')
+
+            # then
+            self.assertEqual("File/folder 'lib' does not exist in HEAD", str(context.exception))
+
+    def test_should_reject_unsupported_options(self):
+        for option, unsupported in [
+            (['--watch'], '--watch'),
+            (['--stats'], '--stats'),
+            (['--cache', '.cache'], '--cache'),
+            (['--log-format', 'jsonl'], '--log-format'),
+            (['--jobs', '2'], '--jobs'),
+        ]:
+            with self.subTest(option), directory() as tmp:
+                # given
+                self.given_templates(tmp, '/** {documentary:foo} */')
+                commit(tmp)
+
+                with stubbed_output() as lines:
+                    # when
+                    with self.assertRaises(SystemExit) as context:
+                        run(parse_args([tmp.join(), '--template', 'src', '--from-git', 'HEAD', *option]))
+
+                    # then
+                    self.assertEqual(2, context.exception.code)
+                    self.assertEqual([f'Option(s) not supported with --from-git: {unsupported}'], lines())
+
+    def given_templates(self, tmp, template: str):
+        tmp.store('src/First.php', template)
+        tmp.store('documentary/src/First.php/declaration.json', '{"foo": {"param": {"bar": "int"}}}')
+        tmp.store('documentary/project/fragment/param.bar.html', 'Bar')
+
+
+class GitTest(TestCase):
+    def test_should_read_tree_relative_to_root(self):
+        with directory() as tmp:
+            # given
+            tmp.store('root/src/First.php', 'First')
+            tmp.store('Other.php', 'Other')
+            commit(tmp)
+
+            # when
+            blobs = dict(tree(tmp.join('root'), 'HEAD'))
+
+            # then
+            self.assertEqual(['src/First.php'], list(blobs))
+            self.assertEqual({blobs['src/First.php']: b'First'}, read_blobs(tmp.join('root'), list(blobs.values())))
+
+    def test_should_read_blobs(self):
+        with directory() as tmp:
+            # given
+            tmp.store('First.php', 'First\n')
+            tmp.store('Empty.php', '')
+            commit(tmp)
+            blobs = dict(tree(tmp.join(), 'HEAD'))
+
+            # when
+            contents = read_blobs(tmp.join(), [blobs['First.php'], blobs['Empty.php'], blobs['First.php']])
+
+            # then
+            self.assertEqual({blobs['First.php']: b'First\n', blobs['Empty.php']: b''}, contents)
+
+
+def commit(tmp):
+    for command in [['init', '-q'], ['add', '.'], ['-c', 'user.name=test', '-c', 'user.email=test@localhost', 'commit', '-q', '-m', 'Templates']]:
+        subprocess.run(['git', *command], cwd=tmp.join(), check=True)
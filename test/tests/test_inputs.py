@@ -0,0 +1,77 @@
+import asyncio
+from unittest import TestCase
+
+from documentary.inputs import load_document_inputs, read_document_inputs
+from test.tmpdir import directory
+
+
+class DocumentInputsTest(TestCase):
+    def test_should_read_details_and_fragments(self):
+        with directory() as tmp:
+            # given
+            tmp.store('Template.php/definition.json', '{}')
+            tmp.store('Template.php/decoration.json', '{"methods": {}}')
+            tmp.store('Template.php/fragments/method.foo.html', 'Foo')
+            tmp.store('Template.php/fragments/param.bar.html', 'Bar')
+
+            # when
+            inputs = read_document_inputs(tmp.join('Template.php'))
+
+            # then
+            self.assertEqual([b'{}', None, b'{"methods": {}}'], inputs.details)
+            self.assertEqual({'method.foo.html': 'Foo', 'param.bar.html': 'Bar'}, inputs.fragments)
+
+    def test_should_read_without_fragments(self):
+        with directory() as tmp:
+            # given
+            tmp.store('Template.php/definition.json', '{}')
+
+            loop = asyncio.new_event_loop()
+
+            # when
+            try:
+                inputs = loop.run_until_complete(load_document_inputs(tmp.join('Template.php')))
+            finally:
+                loop.close()
+
+            # then
+            self.assertEqual({}, inputs.fragments)
+
+    def test_should_read_fragments_without_fallback(self):
+        with directory() as tmp:
+            # given
+            tmp.store('Template.php/fragments/method.foo.html', 'Foo')
+            read = read_document_inputs(tmp.join('Template.php')).reader(lambda filename: 'fallback: ' + filename)
+
+            # when, then
+            self.assertEqual('Foo', read(tmp.join('Template.php', 'fragments', 'method.foo.html')))
+            self.assertIsNone(read(tmp.join('Template.php', 'fragments', 'method.bar.html')))
+            self.assertEqual('fallback: project/param.bar.html', read('project/param.bar.html'))
+
+    def test_should_read_only_html_fragments(self):
+        with directory() as tmp:
+            # given
+            tmp.store('Template.php/fragments/param.bar.html', 'Bar')
+            with open(tmp.join('Template.php', 'fragments', '.param.bar.html.swp'), 'wb') as file:
+                file.write(b'b0VIM \xff\xfe\x00')
+
+            # when
+            inputs = read_document_inputs(tmp.join('Template.php'))
+
+            # then
+            self.assertEqual({'param.bar.html': 'Bar'}, inputs.fragments)
+
+    def test_should_read_undecodable_fragment_with_fallback(self):
+        with directory() as tmp:
+            # given
+            tmp.store('Template.php/fragments/param.bar.html', 'Bar')
+            with open(tmp.join('Template.php', 'fragments', 'param.baz.html'), 'wb') as file:
+                file.write(b'\xff\xfe\xfa')
+
+            # when
+            read = read_document_inputs(tmp.join('Template.php')).reader(lambda filename: 'fallback: ' + filename)
+
+            # then
+            self.assertEqual('Bar', read(tmp.join('Template.php', 'fragments', 'param.bar.html')))
+            self.assertEqual('fallback: ' + tmp.join('Template.php', 'fragments', 'param.baz.html'),
+                             read(tmp.join('Template.php', 'fragments', 'param.baz.html')))
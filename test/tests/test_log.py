@@ -0,0 +1,67 @@
+import json
+from unittest import TestCase
+
+from documentary.document import document_many, DocumentationException
+from test.std_io import stubbed_output
+from test.tmpdir import directory
+
+
+class JsonLinesLogTest(TestCase):
+    def test_should_log_record_per_template_and_summary(self):
+        with stubbed_output() as lines:
+            with directory() as tmp:
+                # given
+                tmp.store('src/First.php', '/** {documentary:foo} */')
+                tmp.store('src/Second.php', '/** {documentary:foo} */')
+                tmp.store('documentary/src/First.php/definition.json', '{"foo": {"definition": "Valid"}}')
+                tmp.store('documentary/src/Second.php/definition.json', '{"foo": {"definition": 4}}')
+
+                # when
+                with self.assertRaises(DocumentationException):
+                    document_many(tmp.join('documentary'), tmp.join(), 'src', tmp.join('output'), log_format='jsonl')
+
+                # then
+                records = {record.get('template'): record for record in map(json.loads, ''.join(lines(None)).splitlines())}
+                first = records[tmp.join('src', 'First.php')]
+                second = records[tmp.join('src', 'Second.php')]
+                summary = records[None]
+                self.assertEqual(('documented', 1, 41), (first['status'], first['placeholders'], first['bytes_changed']))
+                self.assertGreater(first['duration'], 0)
+                self.assertEqual('error', second['status'])
+                self.assertIn('error', second)
+                self.assertEqual((True, 2, 1, 1), (summary['summary'], summary['templates'], summary['documented'], summary['error']))
+
+    def test_should_log_only_replaced_placeholders(self):
+        with directory() as tmp:
+            # given
+            tmp.store('src/First.php', '/**\n * {documentary:foo}\n *\n * Foo.\n */\n/** {documentary:bar} */')
+            tmp.store('documentary/src/First.php/definition.json', '{"foo": {"definition": "Foo"}, "bar": {"definition": "Bar"}}')
+
+            with stubbed_output() as lines:
+                # when
+                document_many(tmp.join('documentary'), tmp.join(), 'src', tmp.join(), log_format='jsonl')
+                document_many(tmp.join('documentary'), tmp.join(), 'src', tmp.join(), log_format='jsonl')
+
+                # then
+                first, _, second, _ = map(json.loads, ''.join(lines(None)).splitlines())
+                self.assertEqual(('documented', 1), (first['status'], first['placeholders']))
+                self.assertEqual(('unchanged', 0, 0), (second['status'], second['placeholders'], second['bytes_changed']))
+
+    def test_should_log_skipped_templates(self):
+        with directory() as tmp:
+            # given
+            tmp.store('src/First.php', '/** {documentary:foo} */')
+            tmp.store('documentary/src/First.php/definition.json', '{"foo": {"definition": "Valid"}}')
+            with stubbed_output():
+                document_many(tmp.join('documentary'), tmp.join(), 'src', tmp.join('output'), cache=tmp.join('.documentary-cache'))
+
+            with stubbed_output() as lines:
+                # when
+                document_many(tmp.join('documentary'), tmp.join(), 'src', tmp.join('output'), cache=tmp.join('.documentary-cache'),
+                              log_format='jsonl', stats=True)
+
+                # then
+                template, summary = map(json.loads, ''.join(lines(None)).splitlines())
+                self.assertEqual('skipped', template['status'])
+                self.assertEqual(1, summary['skipped'])
+                self.assertIn('discovery', summary['stages'])
@@ -0,0 +1,189 @@
+import json
+import os
+from unittest.mock import patch
+
+from documentary.manifest import Fingerprints, load_manifest, fingerprints
+from test.TestCase import TestCase
+from test.tmpdir import directory
+
+
+class ManifestTest(TestCase):
+    def test_should_not_know_unrecorded_output(self):
+        with directory() as tmp:
+            # when
+            manifest = load_manifest(tmp.join('.documentary-cache'))
+
+            # then
+            self.assertFalse(manifest.unchanged(tmp.join('output.php')))
+
+    def test_should_recognize_unchanged_inputs(self):
+        with directory() as tmp:
+            # given
+            tmp.store('template.php', 'template')
+            self.recorded(tmp, ['template.php', 'missing.html'])
+
+            # when
+            unchanged = load_manifest(tmp.join('.documentary-cache')).unchanged(tmp.join('output.php'))
+
+            # then
+            self.assertTrue(unchanged)
+
+    def test_should_recognize_changed_input(self):
+        with directory() as tmp:
+            # given
+            tmp.store('template.php', 'template')
+            self.recorded(tmp, ['template.php'])
+            tmp.store('template.php', 'changed')
+
+            # when
+            unchanged = load_manifest(tmp.join('.documentary-cache')).unchanged(tmp.join('output.php'))
+
+            # then
+            self.assertFalse(unchanged)
+
+    def test_should_recognize_created_input(self):
+        with directory() as tmp:
+            # given
+            self.recorded(tmp, ['fragment.html'])
+            tmp.store('fragment.html', 'created')
+
+            # when
+            unchanged = load_manifest(tmp.join('.documentary-cache')).unchanged(tmp.join('output.php'))
+
+            # then
+            self.assertFalse(unchanged)
+
+    def test_should_recognize_deleted_input(self):
+        with directory() as tmp:
+            # given
+            tmp.store('fragment.html', 'fragment')
+            self.recorded(tmp, ['fragment.html'])
+            os.remove(tmp.join('fragment.html'))
+
+            # when
+            unchanged = load_manifest(tmp.join('.documentary-cache')).unchanged(tmp.join('output.php'))
+
+            # then
+            self.assertFalse(unchanged)
+
+    def test_should_compare_hash_of_touched_input(self):
+        with directory() as tmp:
+            # given
+            tmp.store('template.php', 'template')
+            self.recorded(tmp, ['template.php'])
+            os.utime(tmp.join('template.php'), ns=(0, 0))
+
+            # when
+            manifest = load_manifest(tmp.join('.documentary-cache'))
+
+            # then
+            self.assertTrue(manifest.unchanged(tmp.join('output.php')))
+            self.assertTrue(manifest._modified)
+
+    def test_should_discard_manifest_of_other_version(self):
+        with directory() as tmp:
+            # given
+            tmp.store('template.php', 'template')
+            self.recorded(tmp, ['template.php'])
+            with open(tmp.join('.documentary-cache'), 'r+') as file:
+                content = json.load(file)
+                file.seek(0)
+                json.dump({**content, 'version': 'other'}, file)
+                file.truncate()
+
+            # when
+            unchanged = load_manifest(tmp.join('.documentary-cache')).unchanged(tmp.join('output.php'))
+
+            # then
+            self.assertFalse(unchanged)
+
+    def test_should_forget_output(self):
+        with directory() as tmp:
+            # given
+            tmp.store('template.php', 'template')
+            manifest = self.recorded(tmp, ['template.php'])
+
+            # when
+            manifest.forget(tmp.join('output.php'))
+
+            # then
+            self.assertFalse(manifest.unchanged(tmp.join('output.php')))
+
+    def test_should_index_dependents(self):
+        with directory() as tmp:
+            # given
+            manifest = load_manifest(tmp.join('.documentary-cache'))
+            manifest.record(tmp.join('first.php'), tmp.join('first.php'), fingerprints([tmp.join('first.php'), tmp.join('shared.html')]))
+            manifest.record(tmp.join('second.php'), tmp.join('second.php'), fingerprints([tmp.join('second.php'), tmp.join('shared.html')]))
+
+            # when
+            dependents = manifest.dependents()
+
+            # then
+            self.assertEqual({
+                tmp.join('first.php'): {tmp.join('first.php')},
+                tmp.join('second.php'): {tmp.join('second.php')},
+                tmp.join('shared.html'): {tmp.join('first.php'), tmp.join('second.php')},
+            }, dependents)
+
+    def test_should_find_affected_outputs(self):
+        with directory() as tmp:
+            # given
+            manifest = load_manifest(tmp.join('.documentary-cache'))
+            manifest.record(tmp.join('first.php'), tmp.join('first.php'), fingerprints([tmp.join('first.php'), tmp.join('shared.html')]))
+            manifest.record(tmp.join('second.php'), tmp.join('second.php'), fingerprints([tmp.join('second.php')]))
+
+            # when
+            affected = manifest.affected([tmp.join('shared.html'), tmp.join('other.html')])
+
+            # then
+            self.assertEqual({tmp.join('first.php')}, affected)
+
+    def recorded(self, tmp, inputs: list):
+        manifest = load_manifest(tmp.join('.documentary-cache'))
+        manifest.record(tmp.join('output.php'), tmp.join('template.php'), fingerprints([tmp.join(i) for i in inputs]))
+        manifest.save()
+        return manifest
+
+
+class FingerprintsTest(TestCase):
+    def test_should_hash_shared_input_once(self):
+        with directory() as tmp:
+            # given
+            tmp.store('shared.html', 'Shared')
+            fingerprints = Fingerprints()
+
+            with patch('documentary.manifest._hash', return_value='hash') as hashed:
+                # when
+                first = fingerprints([tmp.join('shared.html')])
+                second = fingerprints([tmp.join('shared.html')])
+
+            # then
+            self.assertEqual(first, second)
+            self.assertEqual(1, hashed.call_count)
+
+    def test_should_hash_changed_input_again(self):
+        with directory() as tmp:
+            # given
+            tmp.store('shared.html', 'Shared')
+            fingerprints = Fingerprints()
+            fingerprints([tmp.join('shared.html')])
+            tmp.store('shared.html', 'Changed')
+
+            # when
+            fingerprinted = fingerprints([tmp.join('shared.html')])
+
+            # then
+            self.assertEqual(fingerprint_of(tmp.join('shared.html')), fingerprinted[tmp.join('shared.html')])
+
+    def test_should_fingerprint_missing_input(self):
+        with directory() as tmp:
+            # when
+            fingerprinted = Fingerprints()([tmp.join('missing.html')])
+
+            # then
+            self.assertEqual({tmp.join('missing.html'): None}, fingerprinted)
+
+
+def fingerprint_of(filename: str) -> list:
+    return fingerprints([filename])[filename]
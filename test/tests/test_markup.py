@@ -1,7 +1,7 @@
 from unittest import TestCase
 from unittest.mock import MagicMock
 
-from documentary.markup import replace_template_strings
+from documentary.markup import replace_template_strings, replace_line_template_strings
 
 
 class CodePartsTest(TestCase):
@@ -28,3 +28,26 @@ class CodePartsTest(TestCase):
 
         # then
         mock.assert_called_with("['Foo', \"Bar\"]")
+
+    def test_replace_line_parts(self):
+        # when
+        code = replace_line_template_strings("Foo `code` and `param` Bar", frozenset({'param'}))
+
+        # then
+        self.assertEqual(code, "Foo <b>code</b> and <i>param</i> Bar")
+
+    def test_replace_line_parts_unpaired(self):
+        # when
+        code = replace_line_template_strings("Foo ``code` Bar `", frozenset())
+
+        # then
+        self.assertEqual(code, "Foo `<b>code</b> Bar `")
+
+    def test_replace_line_parts_as_template_strings(self):
+        for line in ["", "`", "``", "```", "`a`b`", "a``b`c`", "`a\nb`", "`a\r`b`", " `a` ", "`a` `b"]:
+            with self.subTest(line):
+                # when
+                code = replace_line_template_strings(line, frozenset({'a'}))
+
+                # then
+                self.assertEqual(code, replace_template_strings(line, lambda x: 'i' if x == 'a' else 'b'))
@@ -187,6 +187,46 @@ Replaced
         # then
         self.assertEqual(second=result, first="\nReplaced\n         */\n        ")
 
+    def test_replaces_last_placeholder_in_line(self):
+        # given
+        string = "/** {documentary:first} */ /** {documentary:second} */"
+
+        # when
+        result = populate(string, lambda method, *_: method)
+
+        # then
+        self.assertEqual(second=result, first="second")
+
+    def test_replaces_placeholder_after_unclosed_placeholder_in_line(self):
+        # given
+        string = "/** {documentary:first} */ /** {documentary:second}"
+
+        # when
+        result = populate(string, lambda method, *_: method)
+
+        # then
+        self.assertEqual(second=result, first="first /** {documentary:second}")
+
+    def test_ignores_placeholder_in_line_of_previous_placeholder(self):
+        # given
+        string = "/** {documentary:first}\n */ /** {documentary:second} */"
+
+        # when
+        result = populate(string, lambda method, *_: method)
+
+        # then
+        self.assertEqual(second=result, first="first /** {documentary:second} */")
+
+    def test_replaces_placeholders_between_regular_comments(self):
+        # given
+        string = "/** Regular */\n/** {documentary:first} */\n/**\n * Regular\n */\n  /** {documentary:second} */"
+
+        # when
+        result = populate(string, lambda method, indent, _: f"{method}:{indent}")
+
+        # then
+        self.assertEqual(second=result, first="/** Regular */\nfirst:0\n/**\n * Regular\n */\nsecond:2")
+
     def assertIgnoresPlaceholder(self, string: str):
         self.assertEqual(first=string,
                          second=populate(string, lambda *_: ''),
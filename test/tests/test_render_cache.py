@@ -0,0 +1,72 @@
+from unittest import TestCase
+
+from documentary.render_cache import RenderCache
+from documentary.template import bootstrap
+
+
+class RenderCacheTest(TestCase):
+    def test_should_render_once(self):
+        # given
+        cache = RenderCache()
+        rendered = []
+
+        # when
+        first = cache.get(('key',), lambda: rendered.append(1) or 'Foo')
+        second = cache.get(('key',), lambda: rendered.append(2) or 'Bar')
+
+        # then
+        self.assertEqual(['Foo', 'Foo'], [first, second])
+        self.assertEqual([1], rendered)
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+    def test_should_evict_least_recently_used(self):
+        # given
+        cache = RenderCache(maxsize=2)
+        cache.get(('first',), lambda: 'first')
+        cache.get(('second',), lambda: 'second')
+        cache.get(('first',), lambda: 'first')
+
+        # when
+        cache.get(('third',), lambda: 'third')
+
+        # then
+        self.assertEqual('first', cache.get(('first',), lambda: 'rendered again'))
+        self.assertEqual('rendered again', cache.get(('second',), lambda: 'rendered again'))
+
+    def test_should_reuse_docblock_of_identical_method(self):
+        # given
+        cache = RenderCache()
+        details = {'first': _method('Summary'), 'second': _method('Summary'), 'third': _method('Other')}
+        template = bootstrap(details, {}, 'documentary', 'fragments', False, lambda filename: None, cache)
+
+        # when
+        result = template('/** @documentary first */\n/** @documentary second */\n/** @documentary third */')
+
+        # then
+        self.assertEqual('/**\n * Summary.\n */\n/**\n * Summary.\n */\n/**\n * Other.\n */', result)
+        self.assertEqual((1, 2), (cache.hits, cache.misses))
+
+    def test_should_not_reuse_docblock_of_different_indent(self):
+        # given
+        cache = RenderCache()
+        template = bootstrap({'method': _method('Summary')}, {}, 'documentary', 'fragments', False, lambda filename: None, cache)
+
+        # when
+        result = template('/** @documentary method */\n  /** @documentary method */')
+
+        # then
+        self.assertEqual('/**\n * Summary.\n */\n  /**\n   * Summary.\n   */', result)
+        self.assertEqual((0, 2), (cache.hits, cache.misses))
+
+
+def _method(definition: str) -> dict:
+    return {
+        'definition': definition,
+        'param': {},
+        'return': None,
+        'template': {},
+        'return-type': None,
+        'throws': [],
+        'see': [],
+        'link': [],
+    }
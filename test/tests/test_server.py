@@ -0,0 +1,234 @@
+import os
+import stat
+import threading
+import time
+from unittest.mock import patch
+
+from documentary.__main__ import _without_server
+from documentary.args import default_socket
+from documentary.server import Documenter, serve, request
+from test.TestCase import TestCase
+from test.std_io import stubbed_output
+from test.tmpdir import directory
+
+
+class DocumenterTest(TestCase):
+    def test_should_document_templates(self):
+        with directory() as tmp:
+            # given
+            self.given_templates(tmp)
+
+            with stubbed_output() as lines:
+                # when
+                status = Documenter().document([tmp.join(), '--template', 'src'])
+
+                # then
+                self.assertEqual(0, status)
+                self.assertCountDifference(lines(), [
+                    f'File "{tmp.join("src", "First.php")}" documented',
+                    f'File "{tmp.join("src", "Second.php")}" documented',
+                ])
+
+    def test_should_document_changes_between_requests(self):
+        with directory() as tmp:
+            # given
+            self.given_templates(tmp)
+            documenter = Documenter()
+            with stubbed_output():
+                documenter.document([tmp.join(), '--template', 'src'])
+            tmp.store('documentary/project/fragment/param.bar.html', 'Changed')
+
+            with stubbed_output():
+                # when
+                documenter.document([tmp.join(), '--template', 'src'])
+
+            # then
+            self.assertEqual('/**\n * {documentary:foo}\n *\n * @param int $bar Changed\n */', tmp.open('src/First.php'))
+
+    def test_should_fail_for_missing_template(self):
+        with directory() as tmp:
+            # given
+            self.given_templates(tmp)
+
+            with stubbed_output() as lines:
+                # when
+                status = Documenter().document([tmp.join(), '--template', 'missing'])
+
+                # then
+                self.assertEqual(1, status)
+                self.assertEqual([f'Tried to documentation file "{tmp.join("missing")}", but it doesn\'t exist'], lines())
+
+    def test_should_reject_unsupported_options(self):
+        for option, unsupported in [
+            (['--from-git', 'HEAD'], '--from-git'),
+            (['--watch'], '--watch'),
+            (['--changed', 'src/First.php'], '--cache, --changed'),
+            (['--log-format', 'jsonl'], '--log-format'),
+            (['--jobs', '2'], '--jobs'),
+        ]:
+            with self.subTest(option), directory() as tmp:
+                # given
+                self.given_templates(tmp)
+
+                with stubbed_output() as lines:
+                    # when
+                    status = Documenter().document([tmp.join(), '--template', 'src', *option])
+
+                    # then
+                    self.assertEqual(2, status)
+                    self.assertEqual([f'Option(s) not supported by the server: {unsupported}'], lines())
+                    self.assertEqual('/** {documentary:foo} */', tmp.open('src/First.php'))
+
+    def test_should_document_changed_preloaded_fragment(self):
+        with directory() as tmp:
+            # given
+            self.given_templates(tmp)
+            documenter = Documenter()
+            with stubbed_output():
+                documenter.document([tmp.join(), '--template', 'src/First.php'])
+            tmp.store('documentary/project/fragment/param.baz.html', 'Changed')
+            tmp.store('documentary/src/First.php/declaration.json', '{"foo": {"param": {"baz": "int"}}}')
+
+            with stubbed_output():
+                # when
+                documenter.document([tmp.join(), '--template', 'src/First.php'])
+
+            # then
+            self.assertEqual('/**\n * {documentary:foo}\n *\n * @param int $baz Changed\n */', tmp.open('src/First.php'))
+
+    def test_should_document_created_fragment(self):
+        with directory() as tmp:
+            # given
+            self.given_templates(tmp)
+            documenter = Documenter()
+            with stubbed_output():
+                documenter.document([tmp.join(), '--template', 'src/First.php'])
+            tmp.store('documentary/project/fragment/param.qux.html', 'Qux')
+            os.utime(tmp.join('documentary/project/fragment'), ns=(0, 0))
+            tmp.store('documentary/src/First.php/declaration.json', '{"foo": {"param": {"qux": "int"}}}')
+
+            with stubbed_output():
+                # when
+                documenter.document([tmp.join(), '--template', 'src/First.php'])
+
+            # then
+            self.assertEqual('/**\n * {documentary:foo}\n *\n * @param int $qux Qux\n */', tmp.open('src/First.php'))
+
+    def test_should_fail_for_invalid_arguments(self):
+        with stubbed_output():
+            # when
+            status = Documenter().document(['--jobs', 'many'])
+
+        # then
+        self.assertEqual(2, status)
+
+    def given_templates(self, tmp):
+        tmp.store('src/First.php', '/** {documentary:foo} */')
+        tmp.store('src/Second.php', '/** {documentary:foo} */')
+        tmp.store('documentary/src/First.php/declaration.json', '{"foo": {"param": {"bar": "int"}}}')
+        tmp.store('documentary/src/Second.php/declaration.json', '{"foo": {"param": {"baz": "int"}}}')
+        tmp.store('documentary/project/fragment/param.bar.html', 'Bar')
+        tmp.store('documentary/project/fragment/param.baz.html', 'Baz')
+
+
+class ServerTest(TestCase):
+    def test_should_document_requested_templates(self):
+        with directory() as tmp:
+            # given
+            tmp.store('src/First.php', '/** {documentary:foo} */')
+            tmp.store('documentary/src/First.php/declaration.json', '{"foo": {"param": {"bar": "int"}}}')
+            tmp.store('documentary/project/fragment/param.bar.html', 'Bar')
+            socket_path = tmp.join('documentary.sock')
+            with stubbed_output():
+                threading.Thread(target=serve, args=[socket_path], daemon=True).start()
+                self.wait_for(socket_path)
+
+            # when
+            status, output = request(socket_path, ['.', '--template', 'src'], tmp.join())
+
+            # then
+            self.assertEqual(0, status)
+            self.assertEqual(f'File "{tmp.join("src", "First.php")}" documented\n', output)
+            self.assertEqual('/**\n * {documentary:foo}\n *\n * @param int $bar Bar\n */', tmp.open('src/First.php'))
+
+    def test_should_create_socket_accessible_only_to_user(self):
+        with directory() as tmp:
+            # given
+            socket_path = tmp.join('private', 'documentary.sock')
+
+            with stubbed_output():
+                # when
+                threading.Thread(target=serve, args=[socket_path], daemon=True).start()
+                self.wait_for(socket_path)
+
+            # then
+            self.assertEqual(0o700, stat.S_IMODE(os.stat(tmp.join('private')).st_mode))
+            self.assertEqual(0o600, stat.S_IMODE(os.stat(socket_path).st_mode))
+
+    def test_should_not_serve_in_directory_of_another_user(self):
+        with directory() as tmp:
+            with patch('documentary.server.os.getuid', return_value=os.getuid() + 1):
+                # when
+                with self.assertRaises(PermissionError):
+                    serve(tmp.join('documentary.sock'))
+
+            # then
+            self.assertEqual([], os.listdir(tmp.join()))
+
+    def test_should_not_request_server_of_another_user(self):
+        with directory() as tmp:
+            # given
+            socket_path = tmp.join('documentary.sock')
+            with stubbed_output():
+                threading.Thread(target=serve, args=[socket_path], daemon=True).start()
+                self.wait_for(socket_path)
+
+            with patch('documentary.server.os.getuid', return_value=os.getuid() + 1):
+                # when
+                with self.assertRaises(PermissionError):
+                    request(socket_path, ['.', '--template', 'src'], tmp.join())
+
+    def wait_for(self, socket_path: str):
+        for _ in range(100):
+            try:
+                request(socket_path, ['--help'], '.')
+                return
+            except (FileNotFoundError, ConnectionRefusedError):
+                time.sleep(0.01)
+
+
+class WithoutServerTest(TestCase):
+    def test_should_remove_server_option(self):
+        for argv, expected in [
+            (['--server'], []),
+            (['--server', '--jobs', '2'], ['--jobs', '2']),
+            (['--server', 'socket', 'root'], ['root']),
+            (['--server=socket', 'root'], ['root']),
+            (['root', '--server'], ['root']),
+        ]:
+            with self.subTest(argv):
+                # when
+                arguments = _without_server(argv)
+
+                # then
+                self.assertEqual(expected, arguments)
+
+
+class DefaultSocketTest(TestCase):
+    def test_should_use_runtime_directory(self):
+        with patch.dict(os.environ, {'XDG_RUNTIME_DIR': '/run/user/1000'}):
+            # when
+            socket_path = default_socket()
+
+        # then
+        self.assertEqual(os.path.join('/run/user/1000', 'documentary.sock'), socket_path)
+
+    def test_should_use_directory_of_user_in_temporary_directory(self):
+        with patch.dict(os.environ), patch('tempfile.gettempdir', return_value='/tmp'):
+            os.environ.pop('XDG_RUNTIME_DIR', None)
+
+            # when
+            socket_path = default_socket()
+
+        # then
+        self.assertEqual(os.path.join('/tmp', f'documentary-{os.getuid()}', 'documentary.sock'), socket_path)
@@ -0,0 +1,46 @@
+import subprocess
+import sys
+import unittest
+from os import path
+
+from test.TestCase import TestCase
+
+
+@unittest.skipIf(sys.version_info < (3, 7), "-X importtime requires Python 3.7")
+class StartupTest(TestCase):
+    def test_should_not_import_documenting_modules_on_startup(self):
+        # when
+        imported = _import_times('documentary.__main__')
+
+        # then
+        for module in ['documentary.document', 'documentary.validate', 'schema', 'asyncio', 'concurrent.futures', 'multiprocessing']:
+            with self.subTest(module):
+                self.assertNotIn(module, imported)
+
+    def test_should_not_import_schema_before_validation_fails(self):
+        # when
+        imported = _import_times('documentary.document')
+
+        # then
+        self.assertNotIn('schema', imported)
+
+    def test_should_start_within_budget(self):
+        # when
+        imported = _import_times('documentary.__main__')
+
+        # then
+        self.assertLess(imported['documentary.__main__'], 100_000)
+
+
+def _import_times(module: str) -> dict:
+    # Cumulative import times in microseconds, by the imported module
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                             cwd=path.dirname(path.dirname(path.dirname(path.abspath(__file__)))),
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    times = {}
+    for line in process.stderr.splitlines():
+        if line.startswith('import time:'):
+            _, cumulative, name = line[len('import time:'):].split('|')
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
@@ -0,0 +1,82 @@
+import time
+from unittest import TestCase
+
+from documentary.document import document_many
+from documentary.stats import Stats, count, recording, timed
+from test.std_io import stubbed_output
+from test.tmpdir import directory
+
+
+class StatsTest(TestCase):
+    def test_should_time_nested_stages_exclusively(self):
+        # given
+        stats = Stats()
+
+        # when
+        with recording(stats):
+            with timed('outer'):
+                time.sleep(0.01)
+                with timed('inner'):
+                    time.sleep(0.02)
+
+        # then
+        outer, _ = stats.times['outer']
+        inner, _ = stats.times['inner']
+        self.assertGreaterEqual(inner, 0.02)
+        self.assertLess(outer, 0.02)
+
+    def test_should_count(self):
+        # given
+        stats = Stats()
+
+        # when
+        with recording(stats):
+            count('hits')
+            count('hits', 2)
+
+        # then
+        self.assertEqual({'hits': 3}, stats.counts)
+
+    def test_should_not_record_outside_of_recording(self):
+        # given
+        stats = Stats()
+        with recording(stats):
+            pass
+
+        # when
+        with timed('stage'):
+            count('hits')
+
+        # then
+        self.assertEqual(({}, {}), (stats.times, stats.counts))
+
+    def test_should_merge(self):
+        # given
+        first, second = Stats(), Stats()
+        first.add_time('stage', 1.0, 0.5)
+        second.add_time('stage', 2.0, 1.0)
+        second.count('hits')
+
+        # when
+        merged = first.merge(second).merge(None)
+
+        # then
+        self.assertEqual({'stage': (3.0, 1.5)}, merged.times)
+        self.assertEqual({'hits': 1}, merged.counts)
+
+    def test_should_report_stats_of_documenting(self):
+        with stubbed_output() as lines:
+            with directory() as tmp:
+                # given
+                tmp.store('src/Valid.php', '/** {documentary:foo} */')
+                tmp.store('documentary/src/Valid.php/declaration.json', '{"foo": {"param": {"bar": "int"}}}')
+
+                # when
+                document_many(tmp.join('documentary'), tmp.join(), 'src', tmp.join('output'), stats=True)
+
+                # then
+                self.assertIn('placeholders replaced: 1', lines())
+                self.assertIn('templates written: 1', lines())
+                self.assertIn('bytes written: 50', lines())
+                self.assertTrue(any(line.startswith('rendering ') for line in lines()))
+                self.assertTrue(lines()[-1].endswith(tmp.join('src', 'Valid.php')))
@@ -0,0 +1,158 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from documentary.store import FragmentStore, preload
+from test.tmpdir import directory
+
+
+class FragmentStoreTest(TestCase):
+    def test_should_read_fragment(self):
+        with directory() as tmp:
+            # given
+            tmp.store('fragments/first.html', 'Foo')
+
+            # when
+            result = FragmentStore().read(tmp.join('fragments', 'first.html'))
+
+            # then
+            self.assertEqual('Foo', result)
+
+    def test_should_return_none_for_missing_fragment(self):
+        with directory() as tmp:
+            # given
+            tmp.store('fragments/first.html', 'Foo')
+
+            # when
+            result = FragmentStore().read(tmp.join('fragments', 'second.html'))
+
+            # then
+            self.assertIsNone(result)
+
+    def test_should_return_none_for_missing_directory(self):
+        with directory() as tmp:
+            # when
+            result = FragmentStore().read(tmp.join('missing', 'first.html'))
+
+            # then
+            self.assertIsNone(result)
+
+    def test_should_read_fragment_once(self):
+        with directory() as tmp:
+            # given
+            tmp.store('fragments/first.html', 'Foo')
+            store = FragmentStore()
+            store.read(tmp.join('fragments', 'first.html'))
+            tmp.store('fragments/first.html', 'Changed')
+
+            # when
+            result = store.read(tmp.join('fragments', 'first.html'))
+
+            # then
+            self.assertEqual('Foo', result)
+
+    def test_should_list_directory_once(self):
+        with directory() as tmp:
+            # given
+            tmp.store('fragments/first.html', 'Foo')
+            store = FragmentStore()
+
+            with patch('documentary.store.os.scandir', wraps=__import__('os').scandir) as scandir:
+                with patch('documentary.store.read_file') as read_file:
+                    # when
+                    store.read(tmp.join('fragments', 'second.html'))
+                    store.read(tmp.join('fragments', 'third.html'))
+
+            # then
+            self.assertEqual(1, scandir.call_count)
+            read_file.assert_not_called()
+
+    def test_should_invalidate_fragment(self):
+        with directory() as tmp:
+            # given
+            store = FragmentStore()
+            store.read(tmp.join('fragments', 'first.html'))
+            tmp.store('fragments/first.html', 'Created')
+
+            # when
+            store.invalidate(tmp.join('fragments', 'first.html'))
+
+            # then
+            self.assertEqual('Created', store.read(tmp.join('fragments', 'first.html')))
+
+    def test_should_invalidate_listing_of_folder(self):
+        with directory() as tmp:
+            # given
+            tmp.store('fragments/first.html', 'First')
+            store = FragmentStore()
+            store.read(tmp.join('fragments', 'second.html'))
+            tmp.store('fragments/second.html', 'Created')
+
+            # when
+            store.invalidate(tmp.join('fragments'))
+
+            # then
+            self.assertEqual('Created', store.read(tmp.join('fragments', 'second.html')))
+
+    def test_should_serve_preloaded_fragments(self):
+        with directory() as tmp:
+            # given
+            tmp.store('project/fragment/param.first.html', 'Foo')
+            tmp.store('project/snippet/class.html', 'Bar')
+            store = FragmentStore(preload(tmp.join('project')))
+
+            # when
+            with patch('documentary.store.read_file') as read_file, patch('os.scandir') as scandir:
+                fragment = store.read(tmp.join('project', 'fragment', 'param.first.html'))
+                snippet = store.read(tmp.join('project', 'snippet', 'class.html'))
+                missing = store.read(tmp.join('project', 'fragment', 'param.second.html'))
+
+            # then
+            self.assertEqual(['Foo', 'Bar', None], [fragment, snippet, missing])
+            read_file.assert_not_called()
+            scandir.assert_not_called()
+
+    def test_should_read_invalidated_preloaded_fragment(self):
+        with directory() as tmp:
+            # given
+            tmp.store('project/fragment/param.first.html', 'Foo')
+            store = FragmentStore(preload(tmp.join('project')))
+            tmp.store('project/fragment/param.first.html', 'Bar')
+
+            # when
+            store.invalidate(tmp.join('project', 'fragment', 'param.first.html'))
+
+            # then
+            self.assertEqual('Bar', store.read(tmp.join('project', 'fragment', 'param.first.html')))
+
+    def test_should_not_preload_other_files(self):
+        with directory() as tmp:
+            # given
+            tmp.store('project/fragment/param.first.html', 'Foo')
+            with open(tmp.join('project', '.DS_Store'), 'wb') as file:
+                file.write(b'\x00\x00\x00\x01Bud1\xff\xfe')
+
+            # when
+            preloaded = preload(tmp.join('project'))
+
+            # then
+            self.assertEqual({tmp.join('project', 'fragment', 'param.first.html'): 'Foo'}, preloaded.contents)
+            self.assertEqual(frozenset({'.DS_Store'}), preloaded.listings[tmp.join('project')])
+
+    def test_should_leave_undecodable_fragment_to_read(self):
+        with directory() as tmp:
+            # given
+            with open(tmp.join('param.first.html'), 'wb') as file:
+                file.write(b'\xff\xfe\xfa')
+            store = FragmentStore(preload(tmp.join()))
+
+            # when
+            with self.assertRaises(UnicodeDecodeError):
+                store.read(tmp.join('param.first.html'))
+
+    def test_should_preload_missing_folder(self):
+        with directory() as tmp:
+            # when
+            preloaded = preload(tmp.join('project'))
+
+            # then
+            self.assertEqual(({}, {}), preloaded)
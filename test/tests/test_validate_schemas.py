@@ -0,0 +1,81 @@
+import copy
+import json
+import random
+from unittest import TestCase
+
+from schema import SchemaError
+
+from documentary.validate import definitions, declarations, decorations, definitions_schema, declarations_schema, decorations_schema
+from test.resource import resource
+
+VALUES = [
+    'string', 'int', 'bool', 'boolean[]', 'array', 'callable[]', 'mixed', 'array[]', 'optional', '&ref', 'PREG_SPLIT', 'lower_case',
+    'when', 'return', 'type', 'keys', 'values', 'see', 'link', 'throws', 'methods', 'exceptions', 'snippets', '',
+    0, 2, True, False, None, [], {}, ['string'], ['int', 'optional'], {'type': 'int'}, {'bit-sum': ['A_B']},
+    {'type': 'array', 'keys': 'int', 'values': 'string'}, {'when': 'a', 'return': 'b'}, ['a', 'b'],
+]
+KEYS = ['inherit', 'definition', 'return', 'const', 'param', 'template', 'return-type', 'class', 'methods', 'groups', '*',
+        'see', 'link', 'manual', 'throws', 'snippets', 'type', 'optional', 'ref', 'bit-sum', 'keys', 'values', 'when',
+        'exceptions', 'match', 'other']
+
+
+class CompiledValidationTest(TestCase):
+    def test_definitions(self):
+        self.assertAgrees(definitions, definitions_schema(), self.documents('definition.json', {'match': {'return': {'int': {'when': 'a', 'return': 'b'}}}}))
+
+    def test_declarations(self):
+        self.assertAgrees(declarations, declarations_schema(), self.documents('declaration.json', {'match': {'param': {'a': {'type': 'int', 'optional': True}}}}))
+
+    def test_decorations(self):
+        self.assertAgrees(decorations, decorations_schema(), self.documents('decoration.json', {'groups': {'see': [['a', 'b']], 'throws': [{'methods': [], 'exceptions': []}]}}))
+
+    def test_schemas_are_built_once(self):
+        self.assertIs(definitions_schema(), definitions_schema())
+        self.assertIs(declarations_schema(), declarations_schema())
+        self.assertIs(decorations_schema(), decorations_schema())
+
+    def assertAgrees(self, validate: callable, schema, documents: list):
+        for document in documents:
+            with self.subTest(json.dumps(document)):
+                self.assertEqual(self.valid(lambda: schema.validate(copy.deepcopy(document))), self.valid(lambda: validate(document)))
+
+    def valid(self, validate: callable) -> bool:
+        try:
+            validate()
+            return True
+        except SchemaError:
+            return False
+
+    def documents(self, filename: str, extra: dict) -> list:
+        generator = random.Random(filename)
+        originals = [extra, *(self.load(template, filename) for template in ['src/SafeRegex/preg.php', 'src/CleanRegex/Pattern.php'])]
+        return [*originals, *(self.mutated(generator, copy.deepcopy(generator.choice(originals))) for _ in range(300))]
+
+    def load(self, template: str, filename: str) -> dict:
+        with open(resource(f'input/documentary/{template}/{filename}')) as file:
+            return json.load(file)
+
+    def mutated(self, generator: random.Random, document):
+        containers = list(self.containers(document))
+        container = generator.choice(containers) if containers else None
+        if not container:
+            return generator.choice(VALUES)
+        if isinstance(container, list):
+            index = generator.randrange(len(container))
+            container[index] = copy.deepcopy(generator.choice(VALUES))
+            return document
+        key = generator.choice(list(container))
+        mutation = generator.randrange(3)
+        if mutation == 0:
+            del container[key]
+        elif mutation == 1:
+            container[key] = copy.deepcopy(generator.choice(VALUES))
+        else:
+            container[generator.choice(KEYS)] = copy.deepcopy(generator.choice(VALUES))
+        return document
+
+    def containers(self, value):
+        if isinstance(value, (dict, list)) and value:
+            yield value
+            for item in (value.values() if isinstance(value, dict) else value):
+                yield from self.containers(item)
@@ -0,0 +1,117 @@
+from documentary.watch import Session, InotifyWatcher, PollingWatcher
+from test.TestCase import TestCase
+from test.std_io import stubbed_output
+from test.tmpdir import directory
+
+
+class SessionTest(TestCase):
+    def test_should_document_all_templates_initially(self):
+        with directory() as tmp:
+            # given
+            self.given_templates(tmp)
+
+            with stubbed_output() as lines:
+                # when
+                Session(tmp.join('documentary'), tmp.join(), 'src', tmp.join()).update(None)
+
+                # then
+                self.assertCountDifference(lines(), [
+                    f'File "{tmp.join("src", "First.php")}" documented',
+                    f'File "{tmp.join("src", "Second.php")}" documented',
+                ])
+
+    def test_should_document_templates_affected_by_change(self):
+        with directory() as tmp:
+            # given
+            self.given_templates(tmp)
+            session = Session(tmp.join('documentary'), tmp.join(), 'src', tmp.join())
+            with stubbed_output():
+                session.update(None)
+            tmp.store('documentary/project/fragment/param.bar.html', 'Changed')
+
+            with stubbed_output() as lines:
+                # when
+                session.update({tmp.join('documentary/project/fragment/param.bar.html')})
+
+                # then
+                self.assertEqual([f'File "{tmp.join("src", "First.php")}" documented'], lines())
+                self.assertEqual('/**\n * {documentary:foo}\n *\n * @param int $bar Changed\n */', tmp.open('src/First.php'))
+
+    def test_should_reload_changed_details(self):
+        with directory() as tmp:
+            # given
+            self.given_templates(tmp)
+            session = Session(tmp.join('documentary'), tmp.join(), 'src', tmp.join())
+            with stubbed_output():
+                session.update(None)
+            tmp.store('documentary/src/Second.php/declaration.json', '{"foo": {"param": {"bar": "int"}}}')
+
+            with stubbed_output() as lines:
+                # when
+                session.update({tmp.join('documentary/src/Second.php/declaration.json')})
+
+                # then
+                self.assertEqual([f'File "{tmp.join("src", "Second.php")}" documented'], lines())
+                self.assertEqual('/**\n * {documentary:foo}\n *\n * @param int $bar Bar\n */', tmp.open('src/Second.php'))
+
+    def test_should_ignore_own_writes(self):
+        with directory() as tmp:
+            # given
+            self.given_templates(tmp)
+            session = Session(tmp.join('documentary'), tmp.join(), 'src', tmp.join())
+            with stubbed_output():
+                session.update(None)
+
+            with stubbed_output() as lines:
+                # when
+                session.update({tmp.join('src/First.php'), tmp.join('src/Second.php')})
+
+                # then
+                self.assertEqual([], lines())
+
+    def given_templates(self, tmp):
+        tmp.store('src/First.php', '/** {documentary:foo} */')
+        tmp.store('src/Second.php', '/** {documentary:foo} */')
+        tmp.store('documentary/src/First.php/declaration.json', '{"foo": {"param": {"bar": "int"}}}')
+        tmp.store('documentary/src/Second.php/declaration.json', '{"foo": {"param": {"baz": "int"}}}')
+        tmp.store('documentary/project/fragment/param.bar.html', 'Bar')
+
+
+class WatcherTest(TestCase):
+    def test_inotify(self):
+        with directory() as tmp:
+            # given
+            tmp.store('folder/existing.html', 'existing')
+            watcher = InotifyWatcher([tmp.join('folder')])
+
+            # when
+            tmp.store('folder/existing.html', 'changed')
+            tmp.store('folder/sub/created.html', 'created')
+            changed = self.collect(watcher)
+            watcher.close()
+
+            # then
+            self.assertIn(tmp.join('folder', 'existing.html'), changed)
+            self.assertIn(tmp.join('folder', 'sub', 'created.html'), changed)
+
+    def test_polling(self):
+        with directory() as tmp:
+            # given
+            tmp.store('folder/existing.html', 'existing')
+            watcher = PollingWatcher([tmp.join('folder')], interval=0.01)
+
+            # when
+            tmp.store('folder/existing.html', 'changed')
+            tmp.store('folder/sub/created.html', 'created')
+            changed = watcher.changes(None)
+
+            # then
+            self.assertEqual({tmp.join('folder', 'existing.html'), tmp.join('folder', 'sub', 'created.html')}, changed)
+
+    def collect(self, watcher) -> set:
+        changed = watcher.changes(1)
+        more = watcher.changes(0.1)
+        while more:
+            changed |= more
+            more = watcher.changes(0.1)
+        return changed
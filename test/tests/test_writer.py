@@ -0,0 +1,79 @@
+import os
+from unittest import TestCase
+from unittest.mock import patch
+
+from documentary.writer import Writer, sync, digest, file_digest
+from test.tmpdir import directory
+
+
+class WriterTest(TestCase):
+    def test_should_write_chunks(self):
+        with directory() as tmp:
+            # when
+            Writer().write(tmp.join('folder', 'output.php'), [b'first ', b'second'])
+
+            # then
+            self.assertEqual('first second', tmp.open('folder', 'output.php'))
+            self.assertEqual(['output.php'], os.listdir(tmp.join('folder')))
+
+    def test_should_replace_output(self):
+        with directory() as tmp:
+            # given
+            tmp.store('output.php', 'existing content')
+
+            # when
+            Writer().write(tmp.join('output.php'), [b'new'])
+
+            # then
+            self.assertEqual('new', tmp.open('output.php'))
+
+    def test_should_create_directory_once(self):
+        with directory() as tmp:
+            # given
+            writer = Writer()
+
+            with patch('documentary.writer.os.makedirs', wraps=os.makedirs) as makedirs:
+                # when
+                writer.write(tmp.join('folder', 'first.php'), [b'first'])
+                writer.write(tmp.join('folder', 'second.php'), [b'second'])
+
+            # then
+            self.assertEqual(1, makedirs.call_count)
+
+    def test_should_not_leave_temporary_file_on_error(self):
+        with directory() as tmp:
+            # given
+            tmp.store('output.php', 'existing')
+
+            def chunks():
+                yield b'partial'
+                raise ValueError()
+
+            # when
+            with self.assertRaises(ValueError):
+                Writer().write(tmp.join('output.php'), chunks())
+
+            # then
+            self.assertEqual(['output.php'], os.listdir(tmp.join()))
+            self.assertEqual('existing', tmp.open('output.php'))
+
+    def test_should_sync(self):
+        with directory() as tmp:
+            # given
+            tmp.store('output.php', 'content')
+
+            with patch('documentary.writer.os.fsync') as fsync:
+                # when
+                sync([tmp.join('output.php'), tmp.join('missing.php')])
+
+            # then
+            self.assertEqual(2, fsync.call_count)
+
+    def test_should_digest_file_as_chunks(self):
+        with directory() as tmp:
+            # given
+            tmp.store('output.php', 'first second')
+
+            # then
+            self.assertEqual(digest([b'first ', b'second']), file_digest(tmp.join('output.php')))
+            self.assertIsNone(file_digest(tmp.join('missing.php')))